@@ -0,0 +1,289 @@
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from glob import glob
+from pypdf import PdfReader
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+HHS_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PDF_DIR = os.path.join(HHS_ROOT, "pdf")
+TABLE_DIR = os.path.join(HHS_ROOT, "tables")
+MANIFEST_FILENAME = "manifest.json"
+MAX_WORKERS = 4
+
+COLUMNS = [
+    "list_date",
+    "awarding_office",
+    "fain",
+    "award_number",
+    "recipient",
+    "action_date",
+    "title",
+    "authority",
+    "for_cause",
+]
+
+
+# The column header is repeated on every page, and later lists stamp the
+# publication date next to the page number
+HEADER_PATTERN = re.compile(r"Awarding Office FAIN .*?applicable\)")
+FOOTER_PATTERN = re.compile(r"(\d{2}/\d{2}/\d{4} )?Page \d+ of \d+")
+SPLIT_DATE_PATTERN = re.compile(r"\b(\d{1,2}/) ?(\d{1,2}/) ?(\d{4})\b")
+
+# Every entry starts with the awarding office and a FAIN
+ENTRY_PATTERN = re.compile(
+    r"(?:^| )([A-Z]{2,6}(?: OFFICE OF GRANTS MANAGEMENT)?)"
+    r" (?=[A-Z0-9]*\d)([A-Z0-9]{6,}) "
+)
+TOKEN_PATTERN = re.compile(r"\S+")
+AWARD_NUMBER_PATTERN = re.compile(r"(?=\S*\d)[0-9A-Z]{6,}(-[0-9A-Z]+)*")
+DATE_PATTERN = re.compile(r"\d{1,2}/\d{1,2}/\d{4}")
+AMOUNT_PATTERN = re.compile(r"[-$\d,.]+|Pending")
+AUTHORITY_PATTERN = re.compile(r" (N/A - .*?)( X)?( -)?$")
+
+# Award numbers are sometimes printed with spaces, e.g. 5 R01 AG037031-14
+MAX_AWARD_NUMBER_TOKENS = 4
+
+
+# This script runs on its own from public/, so it keeps copies of the
+# helpers in scripts/checksums.py and scripts/json_files.py rather than
+# importing them through a path hack
+
+
+def get_file_checksum(path):
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as src:
+        for chunk in iter(lambda: src.read(1 << 20), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
+
+
+def get_list_date(pdf_path):
+    return datetime.strptime(
+        os.path.basename(pdf_path),
+        "HHS_Grants_Terminated_%Y_%m_%d.pdf"
+    )
+
+
+def get_table_path(pdf_path, table_dir=TABLE_DIR):
+    return os.path.join(
+        table_dir,
+        os.path.basename(pdf_path).lower().replace(".pdf", ".csv")
+    )
+
+
+def get_pdf_text(pdf_path):
+    """Flattens the PDF into one line with wrapped cells rejoined"""
+    parts = []
+    for page in PdfReader(pdf_path).pages:
+        for line in page.extract_text().splitlines():
+            line = line.strip()
+            if not line:
+                continue
+
+            # Words hyphenated across lines are joined back together
+            if parts and not re.search(r"\w-$", parts[-1]):
+                parts.append(" ")
+            parts.append(line)
+
+    text = re.sub(r"\s+", " ", "".join(parts))
+    text = HEADER_PATTERN.sub(" ", text)
+    text = FOOTER_PATTERN.sub(" ", text)
+    text = SPLIT_DATE_PATTERN.sub(r"\1\2\3", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def get_award_number_length(text, match):
+    """Counts the tokens that make up the award number after a FAIN"""
+    fain = match.group(2)
+    tokens = [
+        token.group(0) for _, token in zip(
+            range(MAX_AWARD_NUMBER_TOKENS),
+            TOKEN_PATTERN.finditer(text, match.end())
+        )
+    ]
+    if not tokens:
+        return None
+
+    # Prefer the longest run that spells out the FAIN, and otherwise take
+    # a single token that looks like an award number
+    fain_pattern = re.compile(rf"\d?{fain}(-\d{{2}}([A-Z]\d+)*)?")
+    for n_tokens in range(len(tokens), 0, -1):
+        if fain_pattern.fullmatch("".join(tokens[:n_tokens])):
+            return n_tokens
+    if AWARD_NUMBER_PATTERN.fullmatch(tokens[0]):
+        return 1
+
+    return None
+
+
+def parse_entry(list_date, match, n_tokens, body):
+    tokens = body.split(" ")
+    award_number = "".join(tokens[:n_tokens])
+    tokens = tokens[n_tokens:]
+
+    date_index = next(
+        (i for i, token in enumerate(tokens) if DATE_PATTERN.fullmatch(token)),
+        None
+    )
+    if date_index is None:
+        logger.warning(f"No action date for {award_number}. Skipping...")
+        return None
+
+    recipient = " ".join(tokens[:date_index])
+    action_date = datetime.strptime(tokens[date_index], "%m/%d/%Y")
+    tokens = tokens[date_index + 1:]
+
+    # Later lists add dollar amounts between the date and the title
+    while tokens and AMOUNT_PATTERN.fullmatch(tokens[0]):
+        tokens = tokens[1:]
+
+    title = " ".join(tokens)
+    authority = ""
+    for_cause = False
+    authority_match = AUTHORITY_PATTERN.search(title)
+    if authority_match:
+        authority = authority_match.group(1)
+        for_cause = authority_match.group(2) is not None
+        title = title[:authority_match.start()]
+
+    return {
+        "list_date": list_date.strftime("%Y-%m-%d"),
+        "awarding_office": match.group(1),
+        "fain": match.group(2),
+        "award_number": award_number,
+        "recipient": recipient,
+        "action_date": action_date.strftime("%Y-%m-%d"),
+        "title": title,
+        "authority": authority,
+        "for_cause": for_cause,
+    }
+
+
+def extract_entries(pdf_path):
+    """Parses every terminated award out of one HHS list"""
+    list_date = get_list_date(pdf_path)
+    text = get_pdf_text(pdf_path)
+
+    starts = []
+    for match in ENTRY_PATTERN.finditer(text):
+        n_tokens = get_award_number_length(text, match)
+        if n_tokens is not None:
+            starts.append((match, n_tokens))
+
+    entries = []
+    for i, (match, n_tokens) in enumerate(starts):
+        end = starts[i + 1][0].start() if i + 1 < len(starts) else len(text)
+        entry = parse_entry(
+            list_date,
+            match,
+            n_tokens,
+            text[match.end():end].strip()
+        )
+        if entry is not None:
+            entries.append(entry)
+
+    return entries
+
+
+def write_table(entries, dest_path):
+    with open(dest_path + ".tmp", "w", newline="") as dest:
+        writer = csv.DictWriter(dest, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(entries)
+
+    os.replace(dest_path + ".tmp", dest_path)
+
+
+def load_json(path, default=None):
+    if not os.path.exists(path):
+        return default
+
+    with open(path) as src:
+        return json.load(src)
+
+
+def atomic_write_json(path, obj):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w") as dest:
+        json.dump(obj, dest, indent=4, sort_keys=True)
+
+    os.replace(path + ".tmp", path)
+
+
+def load_manifest(table_dir=TABLE_DIR):
+    return load_json(os.path.join(table_dir, MANIFEST_FILENAME), {})
+
+
+def save_manifest(manifest, table_dir=TABLE_DIR):
+    atomic_write_json(os.path.join(table_dir, MANIFEST_FILENAME), manifest)
+
+
+def extract_all(
+    pdf_dir=PDF_DIR,
+    table_dir=TABLE_DIR,
+    max_workers=MAX_WORKERS,
+    force=False
+):
+    """Extracts every list whose PDF is new or has changed since last run"""
+    os.makedirs(table_dir, exist_ok=True)
+    manifest = load_manifest(table_dir)
+
+    pending = {}
+    for pdf_path in sorted(glob(os.path.join(pdf_dir, "*.pdf"))):
+        checksum = get_file_checksum(pdf_path)
+        name = os.path.basename(pdf_path)
+        if (
+            not force
+            and manifest.get(name) == checksum
+            and os.path.exists(get_table_path(pdf_path, table_dir))
+        ):
+            logger.info(f"{name} is already extracted. Skipping...")
+            continue
+
+        pending[pdf_path] = checksum
+
+    if not pending:
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(extract_entries, pending)
+        for pdf_path, entries in zip(pending, results):
+            name = os.path.basename(pdf_path)
+            logger.info(f"Extracted {len(entries)} entries from {name}")
+            write_table(entries, get_table_path(pdf_path, table_dir))
+
+            # Record progress as each list lands
+            manifest[name] = pending[pdf_path]
+            save_manifest(manifest, table_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Extract HHS termination lists into one table per PDF"
+    )
+    parser.add_argument("--pdf-dir", default=PDF_DIR)
+    parser.add_argument("--table-dir", default=TABLE_DIR)
+    parser.add_argument("--max-workers", type=int, default=MAX_WORKERS)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="re-extract lists even if their checksum has not changed"
+    )
+    args = parser.parse_args()
+
+    extract_all(args.pdf_dir, args.table_dir, args.max_workers, args.force)
@@ -0,0 +1,145 @@
+import argparse
+import duckdb
+import logging
+import os
+
+from catalog import get_analysis_source
+from datetime import datetime
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+START_DATE = "2021-01-01"
+
+
+AWARDS_QUERY = """
+    CREATE TEMP TABLE awards AS
+    SELECT appl_id,
+           project_num_split.appl_type_code,
+           CAST(award_notice_date AS DATE) award_notice_date,
+           award_amount
+    FROM {}
+    WHERE award_notice_date >= '{}'
+      AND project_num_split.appl_type_code IS NOT NULL
+"""
+
+
+# Daily totals with a running total that restarts every year
+AWARD_COUNT_BY_DATE_QUERY = """
+    SELECT award_notice_date,
+           count(appl_id) award_count,
+           year(award_notice_date) "year",
+           dayofyear(award_notice_date) day_of_year,
+           CAST(sum(count(appl_id)) OVER (
+               PARTITION BY year(award_notice_date)
+               ORDER BY award_notice_date
+           ) AS BIGINT) cumulative_award_count
+    FROM awards
+    GROUP BY award_notice_date
+    ORDER BY award_notice_date
+"""
+
+
+AWARD_AMOUNT_BY_DATE_QUERY = """
+    SELECT award_notice_date,
+           CAST(coalesce(sum(award_amount), 0) AS BIGINT) award_amount,
+           year(award_notice_date) "year",
+           dayofyear(award_notice_date) day_of_year,
+           CAST(sum(coalesce(sum(award_amount), 0)) OVER (
+               PARTITION BY year(award_notice_date)
+               ORDER BY award_notice_date
+           ) AS BIGINT) cumulative_award_amount
+    FROM awards
+    GROUP BY award_notice_date
+    ORDER BY award_notice_date
+"""
+
+
+AWARD_COUNT_BY_TYPE_QUERY = """
+    SELECT award_notice_date,
+           appl_type_code,
+           count(appl_id) award_count
+    FROM awards
+    WHERE award_notice_date >= '{}'
+    GROUP BY award_notice_date, appl_type_code
+    ORDER BY award_notice_date, appl_type_code
+"""
+
+
+def write_award_curves(
+    dest_dir,
+    cutoff_date,
+    data_date=None,
+    start_date=START_DATE
+):
+    """Writes the award count, amount and type tables for a week"""
+    con = duckdb.connect()
+    con.execute(
+        AWARDS_QUERY.format(get_analysis_source(data_date, con), start_date)
+    )
+    os.makedirs(dest_dir, exist_ok=True)
+
+    # Counts stop at the same point in every year as the cutoff
+    award_count_by_date = con.execute(AWARD_COUNT_BY_DATE_QUERY).df()
+    award_count_by_date = award_count_by_date[
+        award_count_by_date.day_of_year < cutoff_date.timetuple().tm_yday
+    ]
+    award_count_by_date.to_csv(
+        os.path.join(dest_dir, "award_count_by_date.csv"),
+        index=False
+    )
+
+    con.execute(AWARD_AMOUNT_BY_DATE_QUERY).df().to_csv(
+        os.path.join(dest_dir, "award_amount_by_date.csv"),
+        index=False
+    )
+
+    con.execute(
+        AWARD_COUNT_BY_TYPE_QUERY.format(
+            datetime(cutoff_date.year, 1, 1).strftime("%Y-%m-%d")
+        )
+    ).df().to_csv(
+        os.path.join(
+            dest_dir,
+            f"award_count_{cutoff_date.year}_by_activity_code.csv"
+        ),
+        index=False
+    )
+    con.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write cumulative award count and amount tables"
+    )
+    parser.add_argument(
+        "cutoff_date",
+        type=datetime.fromisoformat,
+        help="date the weekly report is written for"
+    )
+    parser.add_argument(
+        "dest_dir",
+        help="directory to write the CSVs to"
+    )
+    parser.add_argument(
+        "--date",
+        type=datetime.fromisoformat,
+        default=None,
+        help="snapshot to use, defaults to the current download"
+    )
+    parser.add_argument(
+        "--start-date",
+        default=START_DATE,
+        help="earliest award notice date to include"
+    )
+    args = parser.parse_args()
+
+    write_award_curves(
+        args.dest_dir,
+        args.cutoff_date,
+        args.date,
+        args.start_date
+    )
@@ -0,0 +1,262 @@
+import argparse
+import datetime
+import duckdb
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+
+import write_changelog_of_dates as changelog
+
+from glob import glob
+from synthetic_snapshots import FIRST_DATE, generate_snapshots
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+SAMPLE_INTERVAL = 0.05
+
+
+def get_rss_bytes():
+    """Current resident set size, falling back to the lifetime peak"""
+    try:
+        with open("/proc/self/statm") as src:
+            return int(src.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemorySampler:
+    """Tracks the peak resident memory, DuckDB included, while running"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.peak = max(self.peak, get_rss_bytes())
+            self.stopped.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = get_rss_bytes()
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stopped.set()
+        self.thread.join()
+        self.peak = max(self.peak, get_rss_bytes())
+
+
+def count_csv_rows(paths):
+    n_rows = 0
+    for path in paths:
+        with open(path) as src:
+            n_rows += sum(1 for _ in src) - 1
+
+    return n_rows
+
+
+def measure(name, func, count_rows):
+    """Times one stage and records memory and output rows
+
+    DuckDB runs in process, so resident memory covers its buffers as well
+    as the Python side, whichever connection a stage opens.
+    """
+    logger.info(f"Running {name}")
+    start_rss = get_rss_bytes()
+    with MemorySampler() as sampler:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+
+    stage = {
+        "stage": name,
+        "seconds": elapsed,
+        "output_rows": count_rows(result),
+        "peak_rss_bytes": sampler.peak,
+        "peak_rss_increase_bytes": sampler.peak - start_rss,
+    }
+    logger.info(
+        f"{name}: {stage['seconds']:.2f}s, {stage['output_rows']} rows,"
+        f" {stage['peak_rss_bytes'] / 2 ** 20:.0f} MiB peak"
+    )
+    return stage
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure_paths(work_dir):
+    """Points the changelog writer at the synthetic tree"""
+    changelog.DATA_ROOT = os.path.join(work_dir, "data")
+    changelog.STORE_ROOT = os.path.join(work_dir, "data", "store")
+    changelog.CATALOG_PATH = os.path.join(work_dir, "data", "reporter.duckdb")
+    changelog.WEEKLY_CHANGELOG_DIR = os.path.join(
+        work_dir, "public", "changelogs", "weekly", "date"
+    )
+    changelog.COMBINED_CHANGELOG_PATH = os.path.join(
+        work_dir, "public", "changelogs", "combined", "reporter_date_changelog.csv"
+    )
+    changelog.COMBINED_MANIFEST_PATH = os.path.join(
+        work_dir, "data", "changelog_state", "combined_manifest.json"
+    )
+    os.makedirs(changelog.WEEKLY_CHANGELOG_DIR, exist_ok=True)
+    os.makedirs(os.path.dirname(changelog.COMBINED_CHANGELOG_PATH), exist_ok=True)
+
+
+def get_weekly_files():
+    return sorted(glob(os.path.join(
+        changelog.WEEKLY_CHANGELOG_DIR,
+        "reporter_date_changelog_*"
+    )))
+
+
+def remove_weekly_files():
+    for path in get_weekly_files():
+        os.remove(path)
+
+
+def get_wide_changes(data_date):
+    """The old/new column frame clean_data takes for one week"""
+    return duckdb.query(
+        changelog.get_changes_query(
+            data_date,
+            data_date - datetime.timedelta(days=7)
+        )
+    ).df()
+
+
+def run_benchmark(args, work_dir):
+    configure_paths(work_dir)
+
+    start = time.perf_counter()
+    dates = generate_snapshots(
+        changelog.DATA_ROOT,
+        args.n_projects,
+        args.n_weeks,
+        args.churn_rate,
+        FIRST_DATE,
+        args.seed
+    )
+    generate_seconds = time.perf_counter() - start
+
+    stages = [
+        measure(
+            "write_weekly_changelog",
+            changelog.write_weekly_changelog,
+            lambda _: count_csv_rows(get_weekly_files())
+        ),
+    ]
+
+    wide_changes = get_wide_changes(dates[-1])
+    stages.append(measure(
+        "clean_data",
+        lambda: changelog.clean_data(wide_changes),
+        len
+    ))
+
+    stages.append(measure(
+        "write_combined_changelog",
+        changelog.write_combined_changelog,
+        lambda _: count_csv_rows([changelog.COMBINED_CHANGELOG_PATH])
+    ))
+
+    # Drop the newest week so the next merge is incremental
+    os.remove(get_weekly_files()[-1])
+    os.remove(changelog.COMBINED_MANIFEST_PATH)
+    os.remove(changelog.COMBINED_CHANGELOG_PATH)
+    changelog.write_combined_changelog()
+    changelog.write_weekly_changelog()
+    stages.append(measure(
+        "write_combined_changelog_incremental",
+        changelog.write_combined_changelog,
+        lambda _: count_csv_rows([changelog.COMBINED_CHANGELOG_PATH])
+    ))
+
+    remove_weekly_files()
+    stages.append(measure(
+        "backfill_weekly_changelogs",
+        changelog.backfill_weekly_changelogs,
+        lambda _: count_csv_rows(get_weekly_files())
+    ))
+
+    return {
+        "commit": get_git_commit(),
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "duckdb": duckdb.__version__,
+            "cpu_count": os.cpu_count(),
+        },
+        "options": {
+            "n_projects": args.n_projects,
+            "n_weeks": args.n_weeks,
+            "churn_rate": args.churn_rate,
+            "seed": args.seed,
+        },
+        "generate_seconds": generate_seconds,
+        "stages": stages,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the changelog pipeline on synthetic snapshots"
+    )
+    parser.add_argument("--n-projects", type=int, default=100000)
+    parser.add_argument(
+        "--n-weeks",
+        type=int,
+        default=4,
+        help="weekly snapshots after the reference week"
+    )
+    parser.add_argument("--churn-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--work-dir",
+        help="directory for the synthetic tree, defaults to a temporary one"
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="keep the synthetic tree and outputs afterwards"
+    )
+    parser.add_argument("--output", help="file to write the JSON report to")
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="benchmark_changelog_")
+    try:
+        report = run_benchmark(args, work_dir)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    report_json = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, "w") as dest:
+            dest.write(report_json)
+    else:
+        print(report_json)
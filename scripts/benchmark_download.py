@@ -0,0 +1,254 @@
+import argparse
+import datetime
+import json
+import logging
+import multiprocessing
+import os
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+import download_projects
+import requests
+
+from mock_reporter_api import MockReporterServer, generate_records
+from reporter_client import ReporterClient
+from serializers import get_serializer, list_serializers
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+FROM_DATE = datetime.datetime(2025, 1, 1)
+TO_DATE = datetime.datetime(2025, 2, 1)
+
+
+def run_server(port_queue, options):
+    records = generate_records(
+        options["n_records"],
+        options["from_date"],
+        options["to_date"],
+        options["seed"]
+    )
+    server = MockReporterServer(
+        ("127.0.0.1", 0),
+        records,
+        latency=options["latency"],
+        jitter=options["jitter"],
+        error_rate=options["error_rate"],
+        retry_after=options["retry_after"],
+        seed=options["seed"]
+    )
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def start_server(options):
+    """Starts the mock API in its own process so it is not measured"""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=run_server,
+        args=(port_queue, options),
+        daemon=True
+    )
+    process.start()
+    port = port_queue.get(timeout=120)
+
+    return process, f"http://127.0.0.1:{port}"
+
+
+def get_server_stats(server_url):
+    return requests.get(server_url + "/stats").json()
+
+
+def measure(name, server_url, func, count_records):
+    """Runs one benchmark and reports throughput, requests and memory"""
+    before = get_server_stats(server_url)
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    after = get_server_stats(server_url)
+
+    n_records = count_records(result)
+    return {
+        "benchmark": name,
+        "seconds": elapsed,
+        "records": n_records,
+        "records_per_second": n_records / elapsed if elapsed else None,
+        "requests": after["requests"] - before["requests"],
+        "injected_errors": after["errors"] - before["errors"],
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def count_written_records(_):
+    n_records = 0
+    for root, _, filenames in os.walk(download_projects.profile["json_root"]):
+        for filename in filenames:
+            with open(os.path.join(root, filename)) as src:
+                n_records += len(json.load(src))
+
+    return n_records
+
+
+def run_benchmarks(args):
+    options = {
+        "n_records": args.n_records,
+        "from_date": args.from_date,
+        "to_date": args.to_date,
+        "seed": args.seed,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "retry_after": args.retry_after,
+    }
+    logger.info(f"Starting mock API with {args.n_records} records")
+    process, server_url = start_server(options)
+
+    download_projects.MAX_WORKERS = args.workers
+    download_projects.set_profile(args.profile)
+    download_projects.serializer = get_serializer(
+        args.serializer,
+        download_projects.profile["include_fields"]
+    )
+    download_projects.client = ReporterClient(
+        base_url=server_url + "/v2/",
+        requests_per_second=args.requests_per_second,
+        pool_size=args.workers * args.workers,
+        backoff_factor=args.backoff_factor,
+        max_backoff=args.backoff_factor * 8,
+        decode=download_projects.serializer.decode_page
+    )
+    download_projects.logger.setLevel(logging.WARNING)
+
+    # Day files are written relative to the working directory
+    work_dir = tempfile.mkdtemp(prefix="benchmark_download_")
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    window_to_date = args.from_date + datetime.timedelta(days=args.window_days)
+    runs = []
+    try:
+        for _ in range(args.repeat):
+            runs.append(measure(
+                "get_all_items",
+                server_url,
+                lambda: download_projects.get_all_items(
+                    download_projects.get_date_criteria(
+                        args.from_date,
+                        window_to_date
+                    )
+                ),
+                len
+            ))
+
+            shutil.rmtree("data", ignore_errors=True)
+            runs.append(measure(
+                "get_items_for_date_range",
+                server_url,
+                lambda: download_projects.get_items_for_date_range(
+                    args.from_date,
+                    args.to_date
+                ),
+                count_written_records
+            ))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        process.terminate()
+
+    summary = {}
+    for name in ("get_all_items", "get_items_for_date_range"):
+        named = [run for run in runs if run["benchmark"] == name]
+        summary[name] = {
+            "median_seconds": statistics.median(run["seconds"] for run in named),
+            "median_records_per_second": statistics.median(
+                run["records_per_second"] for run in named
+            ),
+            "requests": named[-1]["requests"],
+            "max_peak_memory_bytes": max(
+                run["peak_memory_bytes"] for run in named
+            ),
+        }
+        logger.info(
+            f"{name}: {summary[name]['median_records_per_second']:.0f} records/s,"
+            f" {summary[name]['requests']} requests,"
+            f" {summary[name]['max_peak_memory_bytes'] / 2 ** 20:.1f} MiB peak"
+        )
+
+    return {
+        "options": {
+            **{key: str(value) for key, value in options.items()},
+            "workers": args.workers,
+            "requests_per_second": args.requests_per_second,
+            "window_days": args.window_days,
+            "profile": args.profile,
+            "serializer": download_projects.serializer.name,
+        },
+        "runs": runs,
+        "summary": summary,
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark project downloads against a local mock API"
+    )
+    parser.add_argument("--n-records", type=int, default=40000)
+    parser.add_argument(
+        "--from-date",
+        type=datetime.datetime.fromisoformat,
+        default=FROM_DATE
+    )
+    parser.add_argument(
+        "--to-date",
+        type=datetime.datetime.fromisoformat,
+        default=TO_DATE
+    )
+    parser.add_argument(
+        "--window-days",
+        type=int,
+        default=7,
+        help="length of the single window fetched with get_all_items"
+    )
+    parser.add_argument("--workers", type=int, default=download_projects.MAX_WORKERS)
+    parser.add_argument(
+        "--requests-per-second",
+        type=float,
+        default=0.,
+        help="client rate limit, 0 for none"
+    )
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.)
+    parser.add_argument("--error-rate", type=float, default=0.)
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument("--backoff-factor", type=float, default=0.05)
+    parser.add_argument(
+        "--profile",
+        choices=sorted(download_projects.DOWNLOAD_PROFILES),
+        default="full"
+    )
+    parser.add_argument(
+        "--serializer",
+        choices=list_serializers(),
+        help="JSON backend, defaults to the fastest installed"
+    )
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write the JSON report to")
+    args = parser.parse_args()
+
+    report_json = json.dumps(run_benchmarks(args), indent=4)
+    if args.output:
+        with open(args.output, "w") as dest:
+            dest.write(report_json)
+    else:
+        print(report_json)
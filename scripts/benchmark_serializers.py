@@ -0,0 +1,189 @@
+import argparse
+import datetime
+import json
+import logging
+import platform
+import statistics
+import time
+
+from download_projects import DOWNLOAD_PROFILES, PAGE_SIZE
+from mock_reporter_api import (
+    generate_records,
+    load_fixture_records,
+    project_fields
+)
+from reporter_client import get_api_field_name
+from serializers import get_serializer, list_serializers
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def build_pages(records, page_size=PAGE_SIZE):
+    """Encodes records into search responses shaped like the API's"""
+    pages = []
+    for offset in range(0, len(records), page_size):
+        pages.append(json.dumps({
+            "meta": {
+                "search_id": None,
+                "total": len(records),
+                "offset": offset,
+                "limit": page_size,
+                "sort_field": "appl_id",
+                "sort_order": "asc",
+            },
+            "results": records[offset:offset + page_size],
+        }).encode())
+
+    return pages
+
+
+def count_mismatches(records, lines):
+    """Records that do not come back exactly as the API sent them"""
+    decoded = [json.loads(line) for line in lines.splitlines()]
+    return sum(
+        record != line for record, line in zip(records, decoded)
+    ) + abs(len(records) - len(decoded))
+
+
+def time_call(func, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+
+    return statistics.median(seconds), result
+
+
+def benchmark_serializer(name, pages, records, repeat, fields=None):
+    serializer = get_serializer(name, fields)
+    n_bytes = sum(len(page) for page in pages)
+
+    decode_seconds, decoded = time_call(
+        lambda: [serializer.decode_page(page) for page in pages],
+        repeat
+    )
+    encode_seconds, encoded = time_call(
+        lambda: [serializer.encode_lines(page["results"]) for page in decoded],
+        repeat
+    )
+
+    result = {
+        "serializer": name,
+        "decode_seconds": decode_seconds,
+        "decode_records_per_second": len(records) / decode_seconds,
+        "decode_mib_per_second": n_bytes / 2 ** 20 / decode_seconds,
+        "encode_seconds": encode_seconds,
+        "encode_records_per_second": len(records) / encode_seconds,
+        "output_bytes": sum(len(lines) for lines in encoded),
+        "mismatched_records": count_mismatches(records, b"".join(encoded)),
+    }
+    logger.info(
+        f"{name}: decode {result['decode_records_per_second']:.0f} records/s,"
+        f" encode {result['encode_records_per_second']:.0f} records/s,"
+        f" {result['mismatched_records']} mismatched"
+    )
+    return result
+
+
+def run_benchmark(args):
+    if args.fixture:
+        records = load_fixture_records(args.fixture)
+    else:
+        logger.warning("No fixture given, using synthetic records")
+        records = generate_records(
+            args.n_records,
+            datetime.datetime(2025, 1, 1),
+            datetime.datetime(2025, 4, 1),
+            args.seed
+        )
+    # Pages hold what the API returns for the profile's projection
+    profile = DOWNLOAD_PROFILES[args.profile]
+    records = project_fields(
+        records,
+        [get_api_field_name(field) for field in profile["include_fields"] or []],
+        [get_api_field_name(field) for field in profile["exclude_fields"] or []]
+    )
+    pages = build_pages(records)
+    logger.info(f"Benchmarking {len(records)} records in {len(pages)} pages")
+
+    results = [
+        benchmark_serializer(
+            name,
+            pages,
+            records,
+            args.repeat,
+            profile["include_fields"]
+        )
+        for name in args.serializers
+    ]
+    baseline = next(
+        (result for result in results if result["serializer"] == "json"),
+        None
+    )
+    if baseline is not None:
+        for result in results:
+            result["decode_speedup"] = (
+                baseline["decode_seconds"] / result["decode_seconds"]
+            )
+            result["encode_speedup"] = (
+                baseline["encode_seconds"] / result["encode_seconds"]
+            )
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "serializers": list_serializers(),
+        },
+        "options": {
+            "fixture": args.fixture,
+            "profile": args.profile,
+            "n_records": len(records),
+            "n_pages": len(pages),
+            "input_bytes": sum(len(page) for page in pages),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare JSON backends on decoding and encoding project pages"
+    )
+    parser.add_argument(
+        "--fixture",
+        help="glob of downloaded project JSON files to build pages from"
+    )
+    parser.add_argument(
+        "--n-records",
+        type=int,
+        default=20000,
+        help="synthetic records to use when no fixture is given"
+    )
+    parser.add_argument(
+        "--serializers",
+        nargs="+",
+        choices=list_serializers(),
+        default=list_serializers()
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(DOWNLOAD_PROFILES),
+        default="full",
+        help="download profile whose projection and decoding to benchmark"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="file to write the JSON report to")
+    args = parser.parse_args()
+
+    report_json = json.dumps(run_benchmark(args), indent=4)
+    if args.output:
+        with open(args.output, "w") as dest:
+            dest.write(report_json)
+    else:
+        print(report_json)
@@ -0,0 +1,186 @@
+import argparse
+import duckdb
+import logging
+import os
+
+from convert_to_parquet import read_json_projects, read_parquet_projects
+from datetime import datetime
+from glob import glob
+from partitions import get_pruned_relation
+from snapshot_store import (
+    get_snapshot_query,
+    has_snapshot,
+    list_snapshots,
+    parse_snapshot_dir
+)
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+CATALOG_PATH = os.path.join("/data", "reporter.duckdb")
+CURRENT_ROOT = os.path.join("/data", "json", "projects")
+CURRENT_SOURCE = read_json_projects(os.path.join(CURRENT_ROOT, "*", "*", "*.json"))
+
+
+def get_table_name(data_date):
+    return f"snapshot_{data_date.strftime('%Y_%m_%d')}"
+
+
+def get_snapshot_relation(data_date, added_from=None, added_to=None):
+    """Finds the cheapest source for a weekly snapshot
+
+    Raw copies only scan the partitions that overlap the dates added
+    range when one is given.
+    """
+    if has_snapshot(data_date):
+        return f"({get_snapshot_query(data_date)})"
+
+    parquet_root = f"/data/parquet_{data_date.strftime('%Y_%m_%d')}/projects"
+    json_root = f"/data/json_{data_date.strftime('%Y_%m_%d')}/projects"
+    if added_from is not None or added_to is not None:
+        return get_pruned_relation(
+            parquet_root if os.path.exists(parquet_root) else json_root,
+            added_from,
+            added_to
+        )
+
+    if os.path.exists(parquet_root):
+        return read_parquet_projects(
+            os.path.join(parquet_root, "*", "*", "*.parquet")
+        )
+
+    return read_json_projects(os.path.join(json_root, "*", "*", "*.json"))
+
+
+def list_available_snapshots():
+    dates = set(list_snapshots())
+    for prefix in ("json", "parquet"):
+        for path in glob(f"/data/{prefix}_*"):
+            data_date = parse_snapshot_dir(path, prefix)
+            if data_date is not None:
+                dates.add(data_date)
+
+    return sorted(dates)
+
+
+def refresh_catalog(catalog_path=CATALOG_PATH):
+    """Materializes every snapshot that is not yet in the catalog"""
+    con = duckdb.connect(catalog_path)
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            snapshot_date DATE PRIMARY KEY,
+            table_name VARCHAR,
+            n_records BIGINT,
+            loaded_at TIMESTAMP
+        )
+        """
+    )
+    loaded = {
+        row[0] for row in
+        con.execute("SELECT table_name FROM snapshots").fetchall()
+    }
+
+    for data_date in list_available_snapshots():
+        table_name = get_table_name(data_date)
+        if table_name in loaded:
+            continue
+
+        logger.info(f"Loading {table_name} into catalog")
+        con.execute("BEGIN TRANSACTION")
+        con.execute(
+            f"""
+            CREATE OR REPLACE TABLE {table_name} AS
+            SELECT *
+            FROM {get_snapshot_relation(data_date)}
+            ORDER BY appl_id
+            """
+        )
+        con.execute(
+            f"CREATE INDEX {table_name}_appl_id ON {table_name} (appl_id)"
+        )
+        con.execute(
+            f"CREATE INDEX {table_name}_core_project_num"
+            f" ON {table_name} (core_project_num)"
+        )
+        con.execute(
+            f"""
+            INSERT INTO snapshots
+            SELECT DATE '{data_date.strftime('%Y-%m-%d')}',
+                   '{table_name}',
+                   count(*),
+                   current_timestamp
+            FROM {table_name}
+            """
+        )
+        con.execute("COMMIT")
+
+    # Point the latest view at the newest snapshot
+    latest = con.execute(
+        "SELECT table_name FROM snapshots ORDER BY snapshot_date DESC LIMIT 1"
+    ).fetchone()
+    if latest:
+        con.execute(
+            f"CREATE OR REPLACE VIEW snapshot_latest AS SELECT * FROM {latest[0]}"
+        )
+    con.close()
+
+
+def attach_catalog(con=duckdb, catalog_path=CATALOG_PATH):
+    """Attaches the catalog read-only as `catalog` if it exists"""
+    if not os.path.exists(catalog_path):
+        return False
+
+    con.execute(
+        f"ATTACH IF NOT EXISTS '{catalog_path}' AS catalog (READ_ONLY)"
+    )
+    return True
+
+
+def has_catalog_table(data_date, con=duckdb, catalog_path=CATALOG_PATH):
+    if not attach_catalog(con, catalog_path):
+        return False
+
+    n_tables, = con.execute(
+        f"""
+        SELECT count(*)
+        FROM duckdb_tables()
+        WHERE database_name = 'catalog'
+          AND table_name = '{get_table_name(data_date)}'
+        """
+    ).fetchone()
+    return n_tables > 0
+
+
+def get_analysis_source(
+    data_date=None,
+    con=duckdb,
+    added_from=None,
+    added_to=None
+):
+    """Picks the current download or the best copy of a weekly snapshot
+
+    A dates added range lets raw JSON and Parquet scans skip partitions;
+    callers still filter rows themselves.
+    """
+    if data_date is None:
+        if added_from is None and added_to is None:
+            return CURRENT_SOURCE
+        return get_pruned_relation(CURRENT_ROOT, added_from, added_to)
+    if has_catalog_table(data_date, con):
+        return f"catalog.{get_table_name(data_date)}"
+
+    return get_snapshot_relation(data_date, added_from, added_to)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load new weekly snapshots into the DuckDB catalog"
+    )
+    parser.add_argument("--catalog-path", default=CATALOG_PATH)
+    args = parser.parse_args()
+
+    refresh_catalog(args.catalog_path)
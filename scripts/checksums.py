@@ -0,0 +1,11 @@
+import hashlib
+
+
+def get_file_checksum(path):
+    """sha256 of a file, read in chunks so large files stay out of memory"""
+    sha256 = hashlib.sha256()
+    with open(path, "rb") as src:
+        for chunk in iter(lambda: src.read(1 << 20), b""):
+            sha256.update(chunk)
+
+    return sha256.hexdigest()
@@ -0,0 +1,138 @@
+import argparse
+import duckdb
+import logging
+import os
+
+from catalog import get_analysis_source
+from datetime import datetime
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+TRAINING_CUTOFF = "2025-01-20"
+ADDED_FROM = datetime(2023, 1, 1)
+ADDED_TO = datetime(2025, 12, 31)
+LEVEL_FILES = {
+    "level_1": "project_changes_level_1_project_end_and_award_changes.csv",
+    "level_2": "project_changes_level_2_project_end_changes.csv",
+    "level_3": "project_changes_level_3_training_grant_changes.csv",
+}
+
+
+# One join per week; every row that moved its project end earlier is
+# tagged with the report levels it belongs to
+CLASSIFY_QUERY = """
+    CREATE TEMP TABLE classified_changes AS
+    SELECT new_data.date_added,
+           new_data.appl_id,
+           new_data.project_num,
+           new_data.project_num_split.activity_code activity_code,
+           new_data.project_title,
+           new_data.organization.org_name,
+           old_data.project_start_date,
+           new_data.project_end_date new_project_end_date,
+           old_data.project_end_date old_project_end_date,
+           old_data.budget_start,
+           new_data.budget_end new_budget_end_date,
+           old_data.budget_end old_budget_end_date,
+           new_data.award_amount new_award_amount,
+           old_data.award_amount old_award_amount,
+           new_data.award_amount - old_data.award_amount award_amount_change,
+           new_data.project_num_split.activity_code NOT LIKE 'F%'
+               AND new_data.award_amount < old_data.award_amount level_1,
+           new_data.project_num_split.activity_code NOT LIKE 'F%'
+               AND new_data.award_amount = old_data.award_amount level_2,
+           new_data.project_num_split.activity_code LIKE 'F%'
+               AND new_data.project_end_date >= '{training_cutoff}' level_3
+    FROM {new_source} AS new_data
+    INNER JOIN {old_source} AS old_data
+      ON new_data.appl_id = old_data.appl_id
+    WHERE new_data.year_added BETWEEN 2023 AND 2025
+      AND old_data.year_added BETWEEN 2023 AND 2025
+      AND new_data.project_end_date < old_data.project_end_date
+"""
+
+
+LEVEL_QUERY = """
+    SELECT * EXCLUDE (level_1, level_2, level_3)
+    FROM classified_changes
+    WHERE {}
+    ORDER BY new_project_end_date DESC, appl_id
+"""
+
+
+def write_project_changes(
+    reference_date,
+    dest_dir,
+    data_date=None,
+    training_cutoff=TRAINING_CUTOFF
+):
+    """Writes all three project change reports from a single join"""
+    con = duckdb.connect()
+    logger.info(
+        f"Classifying changes against {reference_date.strftime('%Y-%m-%d')}"
+    )
+    con.execute(
+        CLASSIFY_QUERY.format(
+            new_source=get_analysis_source(
+                data_date,
+                con,
+                ADDED_FROM,
+                ADDED_TO
+            ),
+            old_source=get_analysis_source(
+                reference_date,
+                con,
+                ADDED_FROM,
+                ADDED_TO
+            ),
+            training_cutoff=training_cutoff
+        )
+    )
+
+    os.makedirs(dest_dir, exist_ok=True)
+    for level, filename in LEVEL_FILES.items():
+        data = con.execute(LEVEL_QUERY.format(level)).df()
+        logger.info(f"Writing {len(data)} rows to {filename}")
+        data.to_csv(
+            os.path.join(dest_dir, filename),
+            index=False
+        )
+    con.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write the level 1/2/3 project change reports"
+    )
+    parser.add_argument(
+        "reference_date",
+        type=datetime.fromisoformat,
+        help="date of the snapshot to compare against"
+    )
+    parser.add_argument(
+        "dest_dir",
+        help="directory to write the three CSVs to"
+    )
+    parser.add_argument(
+        "--date",
+        type=datetime.fromisoformat,
+        default=None,
+        help="date of the newer snapshot, defaults to the current download"
+    )
+    parser.add_argument(
+        "--training-cutoff",
+        default=TRAINING_CUTOFF,
+        help="earliest new project end kept for training grant changes"
+    )
+    args = parser.parse_args()
+
+    write_project_changes(
+        args.reference_date,
+        args.dest_dir,
+        args.date,
+        args.training_cutoff
+    )
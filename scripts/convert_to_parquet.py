@@ -0,0 +1,221 @@
+import argparse
+import duckdb
+import logging
+import os
+import shutil
+
+from glob import glob
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+JSON_ROOT = os.path.join("data", "json", "projects")
+PARQUET_ROOT = os.path.join("data", "parquet", "projects")
+
+
+# Explicit schema for RePORTER project records so nothing is re-inferred.
+# Calendar dates are parsed to DATE once here, so downstream comparisons
+# need no date_trunc; only date_added keeps its time of day.
+PROJECT_COLUMNS = {
+    "appl_id": "BIGINT",
+    "subproject_id": "VARCHAR",
+    "fiscal_year": "INTEGER",
+    "project_num": "VARCHAR",
+    "project_serial_num": "VARCHAR",
+    "organization": """STRUCT(
+        org_name VARCHAR,
+        city VARCHAR,
+        country VARCHAR,
+        org_city VARCHAR,
+        org_country VARCHAR,
+        org_state VARCHAR,
+        org_state_name VARCHAR,
+        dept_type VARCHAR,
+        fips_country_code VARCHAR,
+        org_duns VARCHAR[],
+        org_ueis VARCHAR[],
+        primary_duns VARCHAR,
+        primary_uei VARCHAR,
+        org_fips VARCHAR,
+        org_ipf_code VARCHAR,
+        org_zipcode VARCHAR,
+        external_org_id BIGINT
+    )""",
+    "award_type": "VARCHAR",
+    "activity_code": "VARCHAR",
+    "award_amount": "BIGINT",
+    "is_active": "BOOLEAN",
+    "project_num_split": """STRUCT(
+        appl_type_code VARCHAR,
+        activity_code VARCHAR,
+        ic_code VARCHAR,
+        serial_num VARCHAR,
+        support_year VARCHAR,
+        full_support_year VARCHAR,
+        suffix_code VARCHAR
+    )""",
+    "principal_investigators": """STRUCT(
+        profile_id BIGINT,
+        first_name VARCHAR,
+        middle_name VARCHAR,
+        last_name VARCHAR,
+        is_contact_pi BOOLEAN,
+        full_name VARCHAR,
+        title VARCHAR
+    )[]""",
+    "contact_pi_name": "VARCHAR",
+    "program_officers": """STRUCT(
+        first_name VARCHAR,
+        middle_name VARCHAR,
+        last_name VARCHAR,
+        full_name VARCHAR
+    )[]""",
+    "agency_ic_admin": """STRUCT(
+        code VARCHAR,
+        abbreviation VARCHAR,
+        name VARCHAR
+    )""",
+    "agency_ic_fundings": """STRUCT(
+        fy INTEGER,
+        code VARCHAR,
+        name VARCHAR,
+        abbreviation VARCHAR,
+        total_cost DOUBLE,
+        direct_cost_ic DOUBLE,
+        indirect_cost_ic DOUBLE
+    )[]""",
+    "cong_dist": "VARCHAR",
+    "spending_categories": "INTEGER[]",
+    "project_start_date": "DATE",
+    "project_end_date": "DATE",
+    "organization_type": """STRUCT(
+        name VARCHAR,
+        code VARCHAR,
+        is_other BOOLEAN
+    )""",
+    "geo_lat_lon": "STRUCT(lon DOUBLE, lat DOUBLE)",
+    "opportunity_number": "VARCHAR",
+    "full_study_section": """STRUCT(
+        srg_code VARCHAR,
+        srg_flex VARCHAR,
+        sra_designator_code VARCHAR,
+        sra_flex_code VARCHAR,
+        group_code VARCHAR,
+        name VARCHAR
+    )""",
+    "award_notice_date": "DATE",
+    "is_new": "BOOLEAN",
+    "mechanism_code_dc": "VARCHAR",
+    "core_project_num": "VARCHAR",
+    "terms": "VARCHAR",
+    "pref_terms": "VARCHAR",
+    "abstract_text": "VARCHAR",
+    "project_title": "VARCHAR",
+    "phr_text": "VARCHAR",
+    "spending_categories_desc": "VARCHAR",
+    "agency_code": "VARCHAR",
+    "covid_response": "VARCHAR[]",
+    "arra_funded": "VARCHAR",
+    "budget_start": "DATE",
+    "budget_end": "DATE",
+    "cfda_code": "VARCHAR",
+    "funding_mechanism": "VARCHAR",
+    "direct_cost_amt": "BIGINT",
+    "indirect_cost_amt": "BIGINT",
+    "project_detail_url": "VARCHAR",
+    "date_added": "TIMESTAMP",
+}
+PARTITION_TYPES = {
+    "year_added": "INTEGER",
+    "month_added": "VARCHAR",
+}
+
+
+def format_struct(columns):
+    return "{" + ", ".join(
+        f"'{name}': '{' '.join(dtype.split())}'"
+        for name, dtype in columns.items()
+    ) + "}"
+
+
+def format_paths(paths):
+    """Quotes a glob, or a list of files as a DuckDB list"""
+    if isinstance(paths, str):
+        return f"'{paths}'"
+
+    return "[" + ", ".join(f"'{path}'" for path in paths) + "]"
+
+
+def read_json_projects(path_glob):
+    """Builds a read_json call for project files using the fixed schema"""
+    return (
+        f"read_json({format_paths(path_glob)},"
+        f" format='array',"
+        f" hive_partitioning=true,"
+        f" hive_types={format_struct(PARTITION_TYPES)},"
+        f" columns={format_struct(PROJECT_COLUMNS)})"
+    )
+
+
+def read_parquet_projects(path_glob):
+    return f"read_parquet({format_paths(path_glob)}, hive_partitioning=true)"
+
+
+def convert_year(year, json_root=JSON_ROOT, parquet_root=PARQUET_ROOT):
+    """Rewrites the Parquet partitions for one year from the JSON files"""
+    json_glob = os.path.join(json_root, f"year_added={year}", "*", "*.json")
+    if not glob(json_glob):
+        logger.info(f"No JSON files found for {year}")
+        return
+
+    logger.info(f"Converting {year} to Parquet")
+    tmp_root = os.path.join(parquet_root, f".tmp_year_added={year}")
+    shutil.rmtree(tmp_root, ignore_errors=True)
+    os.makedirs(parquet_root, exist_ok=True)
+    duckdb.execute(
+        f"""
+        COPY (
+            SELECT *
+            FROM {read_json_projects(json_glob)}
+            ORDER BY date_added, appl_id
+        ) TO '{tmp_root}' (
+            FORMAT PARQUET,
+            COMPRESSION ZSTD,
+            PARTITION_BY (year_added, month_added)
+        )
+        """
+    )
+
+    # Swap the finished year into place
+    dest_dir = os.path.join(parquet_root, f"year_added={year}")
+    shutil.rmtree(dest_dir, ignore_errors=True)
+    os.replace(os.path.join(tmp_root, f"year_added={year}"), dest_dir)
+    shutil.rmtree(tmp_root)
+
+
+def get_json_years(json_root=JSON_ROOT):
+    return sorted(
+        int(os.path.basename(path).split("=")[1])
+        for path in glob(os.path.join(json_root, "year_added=*"))
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert downloaded JSON project files to Parquet"
+    )
+    parser.add_argument(
+        "years",
+        type=int,
+        nargs="*",
+        help="years to convert, defaults to every downloaded year"
+    )
+    parser.add_argument("--json-root", default=JSON_ROOT)
+    parser.add_argument("--parquet-root", default=PARQUET_ROOT)
+    args = parser.parse_args()
+
+    for year in args.years or get_json_years(args.json_root):
+        convert_year(year, args.json_root, args.parquet_root)
@@ -1,92 +1,276 @@
+import argparse
+import collections
 import copy
 import datetime
 import logging
-import json
 import itertools
 import os
-import requests
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from convert_to_parquet import convert_year
+from json_files import atomic_write_json, load_json
+from partitions import update_partition_stats
 from pprint import pprint
+from reporter_client import ReporterClient, get_api_field_name
+from serializers import get_serializer
 
 logging.basicConfig()
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
-REPORTER_API_URL = "https://api.reporter.nih.gov/v2/"
+PAGE_SIZE = 500
+MAX_RECORDS = 15000
+MAX_WORKERS = 4
+MIN_WINDOW = datetime.timedelta(hours=1)
+FIRST_FISCAL_YEAR = 1981
+LOOKBACK_DAYS = 14
+FIRST_BACKFILL_YEAR = 2012
+LAST_BACKFILL_YEAR = 2025
+FIRST_REFRESH_CACHE_PATH = os.path.join("data", "cache", "first_refresh.json")
+STAGING_DIR = os.path.join("data", "staging")
+
+# Fields the weekly changelog and the analyses read
+TRACKING_FIELDS = [
+    "appl_id",
+    "fiscal_year",
+    "project_num",
+    "core_project_num",
+    "project_num_split",
+    "activity_code",
+    "organization",
+    "project_title",
+    "award_amount",
+    "award_notice_date",
+    "project_start_date",
+    "project_end_date",
+    "budget_start",
+    "budget_end",
+    "date_added",
+]
+# Free text that dominates the size of a full record
+TEXT_FIELDS = [
+    "abstract_text",
+    "phr_text",
+    "terms",
+    "pref_terms",
+]
+
+def get_profile_paths(root):
+    return {
+        "json_root": os.path.join(root, "json", "projects"),
+        "parquet_root": os.path.join(root, "parquet", "projects"),
+        "sync_state_path": os.path.join(root, "sync_state.json"),
+        "backfill_journal_path": os.path.join(root, "backfill_journal.json"),
+    }
+
+
+# Each profile asks the API for a subset of fields and keeps its own tree,
+# so slimmer downloads never overwrite the archival copy. Slim trees live
+# under data/profiles, away from the data/json_YYYY_MM_DD snapshot copies.
+PROFILES_ROOT = os.path.join("data", "profiles")
+DOWNLOAD_PROFILES = {
+    "full": {
+        **get_profile_paths("data"),
+        "include_fields": None,
+        "exclude_fields": None,
+    },
+    "tracking": {
+        **get_profile_paths(os.path.join(PROFILES_ROOT, "tracking")),
+        "include_fields": TRACKING_FIELDS,
+        "exclude_fields": None,
+    },
+    "no_text": {
+        **get_profile_paths(os.path.join(PROFILES_ROOT, "no_text")),
+        "include_fields": None,
+        "exclude_fields": TEXT_FIELDS,
+    },
+}
+profile = DOWNLOAD_PROFILES["full"]
+
+serializer = get_serializer(fields=profile["include_fields"])
+# Windows and the pages within them are both fetched concurrently
+client = ReporterClient(
+    pool_size=MAX_WORKERS * MAX_WORKERS,
+    decode=serializer.decode_page
+)
 
 
 class TooManyRecordsError(Exception):
     pass
 
 
+def set_profile(name):
+    global profile, serializer
+    profile = DOWNLOAD_PROFILES[name]
+    # Records are only typed when the profile names every field it keeps
+    serializer = get_serializer(fields=profile["include_fields"])
+    client.decode = serializer.decode_page
+
+
+def get_field_projection():
+    projection = {}
+    if profile["include_fields"]:
+        projection["include_fields"] = [
+            get_api_field_name(field) for field in profile["include_fields"]
+        ]
+    if profile["exclude_fields"]:
+        projection["exclude_fields"] = [
+            get_api_field_name(field) for field in profile["exclude_fields"]
+        ]
+
+    return projection
+
+
 def get_total_items(criteria):
+    # Only the count is needed, so skip everything but the id
     payload = {
         "criteria": criteria,
+        "include_fields": ["ApplId"],
         "limit": 1
     }
 
-    response = requests.post(
-        os.path.join(REPORTER_API_URL, "projects", "search"),
-        json=payload
-    )
-    response.raise_for_status()
-    data = response.json()
+    data = client.search_projects(payload)
 
     return data["meta"]["total"]
 
 
-def get_all_items(criteria, offset=0):
-    items = []
-
-    # Attempt to download a single data packet
+def get_page(criteria, offset):
     payload = {
         "criteria": criteria,
         "sort_field": "appl_id",
         "offset": offset,
-        "limit": 500
+        "limit": PAGE_SIZE,
+        **get_field_projection()
     }
-    response = requests.post(
-        os.path.join(REPORTER_API_URL, "projects", "search"),
-        json=payload
-    )
-    response.raise_for_status()
-    data = response.json()
+    return client.search_projects(payload)
 
-    if data["meta"]["total"] > 15000:
+
+def iter_pages(criteria):
+    """Yields pages of results in appl_id order with a few in flight"""
+    # The first page tells us how many records there are in total
+    data = get_page(criteria, 0)
+    total = data["meta"]["total"]
+    if total > MAX_RECORDS:
         logger.info(
             "Detected too many records for standard download"
         )
         raise TooManyRecordsError()
 
-    items.extend(
-        data["results"]
-    )
-
-    n_downloaded = offset + len(data["results"])
+    n_downloaded = len(data["results"])
     logger.info(
-        f"Downloaded {n_downloaded} of {data['meta']['total']}"
+        f"Downloaded {n_downloaded} of {total}"
     )
+    yield data["results"]
+
+    # Fetch the remaining pages concurrently, keeping offset order and
+    # never holding more than MAX_WORKERS pages at once
+    offsets = range(PAGE_SIZE, total, PAGE_SIZE)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        pending = collections.deque()
+        for offset in offsets:
+            pending.append(executor.submit(get_page, criteria, offset))
+            if len(pending) < MAX_WORKERS:
+                continue
+
+            results = pending.popleft().result()["results"]
+            n_downloaded += len(results)
+            logger.info(
+                f"Downloaded {n_downloaded} of {total}"
+            )
+            yield results
 
-    # Recursively download if more data
-    next_offset = offset + data["meta"]["limit"]
-    if next_offset < data["meta"]["total"]:
-        items.extend(
-            get_all_items(criteria, next_offset)
-        )
+        while pending:
+            results = pending.popleft().result()["results"]
+            n_downloaded += len(results)
+            logger.info(
+                f"Downloaded {n_downloaded} of {total}"
+            )
+            yield results
+
+
+def get_all_items(criteria):
+    items = list(itertools.chain.from_iterable(iter_pages(criteria)))
+    items.sort(key=lambda x: x["appl_id"])
 
     return items
 
 
-def download_items_for_date(from_date, force=False):
-    # Skip if already downloaded
+class DaySinks:
+    """Appends records to per-day NDJSON shards and finalizes them"""
+
+    def __init__(self):
+        os.makedirs(STAGING_DIR, exist_ok=True)
+        self.staging_dir = tempfile.mkdtemp(prefix="projects_", dir=STAGING_DIR)
+        self.counts = collections.Counter()
+        self.lock = threading.Lock()
+
+    def get_shard_path(self, date):
+        return os.path.join(
+            self.staging_dir,
+            f"projects_added_{date.strftime('%Y_%m_%d')}.ndjson"
+        )
+
+    def write(self, items):
+        groups = collections.defaultdict(list)
+        for item in items:
+            date = datetime.datetime.fromisoformat(item["date_added"]).date()
+            groups[date].append(item)
+        lines = {
+            date: serializer.encode_lines(group)
+            for date, group in groups.items()
+        }
+
+        with self.lock:
+            for date, group in groups.items():
+                with open(self.get_shard_path(date), "ab") as dest:
+                    dest.write(lines[date])
+                self.counts[date] += len(group)
+
+    def finalize(self):
+        """Streams each shard into its JSON file and swaps it into place
+
+        Records are already encoded, so each line is copied as is and the
+        file holds one compact record per line.
+        """
+        for date in sorted(self.counts):
+            logger.info(
+                f"Writing {self.counts[date]} items for {date}"
+            )
+            dest_dir, dest_filename = get_day_path(date)
+            dest_path = os.path.join(dest_dir, dest_filename)
+            os.makedirs(dest_dir, exist_ok=True)
+            with open(self.get_shard_path(date), "rb") as src, \
+                    open(dest_path + ".tmp", "wb") as dest:
+                dest.write(b"[")
+                for ind, line in enumerate(src):
+                    dest.write(b",\n" if ind else b"\n")
+                    dest.write(line.rstrip(b"\n"))
+                dest.write(b"\n]")
+            os.replace(dest_path + ".tmp", dest_path)
+
+        self.cleanup()
+
+    def cleanup(self):
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+
+def get_day_path(date):
     dest_dir = os.path.join(
-        "data",
-        "json",
-        "projects",
-        f"year_added={from_date.strftime('%Y')}",
-        f"month_added={from_date.strftime('%m')}"
+        profile["json_root"],
+        f"year_added={date.strftime('%Y')}",
+        f"month_added={date.strftime('%m')}"
     )
-    dest_filename = f"projects_added_{from_date.strftime('%Y_%m_%d')}.json"
+    dest_filename = f"projects_added_{date.strftime('%Y_%m_%d')}.json"
+
+    return dest_dir, dest_filename
+
+
+def download_items_for_date(from_date, force=False):
+    # Skip if already downloaded
+    dest_dir, dest_filename = get_day_path(from_date)
     if os.path.exists(os.path.join(dest_dir, dest_filename)) and not force:
         logger.info(f"Skipping download for {from_date.strftime('%Y-%m-%d')}")
         return
@@ -101,133 +285,191 @@ def download_items_for_date(from_date, force=False):
             datetime.timedelta(microseconds=1)
     )
 
-    criteria = {
+    # Only write file if records are present
+    sinks = DaySinks()
+    try:
+        for items in iter_pages(get_date_criteria(from_date, to_date)):
+            sinks.write(items)
+        sinks.finalize()
+    finally:
+        sinks.cleanup()
+
+
+def get_date_criteria(from_date, to_date):
+    return {
         "date_added": {
             "from_date": from_date.isoformat(),
             "to_date": to_date.isoformat()
         },
     }
-    items = get_all_items(criteria)
-    if not items:
-        return
 
-    # Only write file if records are present
-    os.makedirs(dest_dir, exist_ok=True)
-    with open(os.path.join(dest_dir, dest_filename), "w") as dest:
-        json.dump(items, dest, indent=4)
+
+def plan_fiscal_year_windows(criteria, fiscal_years, total=None):
+    """Splits a query by fiscal year until each piece fits under the cap"""
+    criteria = dict(criteria, fiscal_years=fiscal_years)
+    if total is None:
+        total = get_total_items(criteria)
+
+    if not total:
+        return []
+    if total <= MAX_RECORDS:
+        return [(criteria, total)]
+    if len(fiscal_years) == 1:
+        logger.info(
+            f"Fiscal year {fiscal_years[0]} alone has {total} records"
+        )
+        raise TooManyRecordsError()
+
+    middle = len(fiscal_years) // 2
+    left_total = get_total_items(
+        dict(criteria, fiscal_years=fiscal_years[:middle])
+    )
+    return (
+        plan_fiscal_year_windows(criteria, fiscal_years[:middle], left_total) +
+        # Probe the right half rather than subtracting, records added
+        # between the two counts would otherwise make it look empty
+        plan_fiscal_year_windows(criteria, fiscal_years[middle:])
+    )
+
+
+def plan_date_windows(from_date, to_date, total=None):
+    """Bisects a date_added range until each piece fits under the cap"""
+    criteria = get_date_criteria(from_date, to_date)
+    if total is None:
+        total = get_total_items(criteria)
+
+    if not total:
+        return []
+    if total <= MAX_RECORDS:
+        return [(criteria, total)]
+
+    # Records added at the same moment can only be split by fiscal year
+    if to_date - from_date < MIN_WINDOW:
+        logger.info(
+            f"Splitting {total} records added from {from_date.isoformat()}"
+            f" to {to_date.isoformat()} by fiscal year"
+        )
+        fiscal_years = list(range(FIRST_FISCAL_YEAR, to_date.year + 2))
+        return plan_fiscal_year_windows(criteria, fiscal_years)
+
+    middle = from_date + (to_date - from_date) / 2
+    left_to_date = middle - datetime.timedelta(microseconds=1)
+    left_total = get_total_items(get_date_criteria(from_date, left_to_date))
+    return (
+        plan_date_windows(from_date, left_to_date, left_total) +
+        # Probe the right half rather than subtracting, records added
+        # between the two counts would otherwise make it look empty
+        plan_date_windows(middle, to_date)
+    )
+
+
+def download_window(criteria, sinks):
+    for items in iter_pages(criteria):
+        sinks.write(items)
 
 
 def get_items_for_date_range(from_date, to_date):
+    """Downloads a date_added range
+
+    Returns how many records the count probes expected and how many were
+    written, which can fall short if pages failed or records moved.
+    """
     # Attempt to download data
     logger.info(
         f"Downloading data from {from_date.isoformat()}"
         f" to {to_date.isoformat()}"
     )
-    criteria = {
-        "date_added": {
-            "from_date": from_date.isoformat(),
-            "to_date": to_date.isoformat()
-        },
-    }
 
-    # Sometimes there are too many records.
-    # In this case we switch to stricter criteria.
-    try:
-        items = get_all_items(criteria)
-        if not items:
-            logger.info(
-                "No items found for date range"
-            )
-            return
-    except TooManyRecordsError:
+    # Split the range with count probes so every window fits under the cap
+    windows = plan_date_windows(from_date, to_date)
+    if not windows:
         logger.info(
-            "Too many records, trying to download by fiscal year"
+            "No items found for date range"
         )
-        total = get_total_items(criteria)
-        fiscal_year = from_date.year + 1
-        items = []
-        while len(items) < total and fiscal_year > 1980:
-            logger.info(
-                f"Downloading data subset for fiscal year {fiscal_year}"
-            )
-            criteria["fiscal_years"] = [fiscal_year]
-            items += get_all_items(criteria)
-            fiscal_year -= 1
-
-        if len(items) < total:
-            raise Exception("Could not get all items using fiscal year")
-
-    # Group by date_added and send to files
+        return 0, 0
     logger.info(
-        f"Found {len(items)} items for date range"
+        f"Downloading date range as {len(windows)} windows"
     )
-    items = sorted(
-        items,
-        key=lambda x: (
-            datetime.datetime.fromisoformat(x["date_added"]).date(),
-            x["appl_id"]
-        )
-    )
-    grouped_items = itertools.groupby(
-        items,
-        lambda x: datetime.datetime.fromisoformat(x["date_added"]).date()
-    )
-    for date, group in grouped_items:
-        group = list(group)
+
+    # Stream pages straight into per-day shards
+    sinks = DaySinks()
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            futures = [
+                executor.submit(download_window, criteria, sinks)
+                for criteria, _ in windows
+            ]
+            for future in futures:
+                future.result()
+
+        expected = sum(total for _, total in windows)
+        found = sum(sinks.counts.values())
         logger.info(
-            f"Writing {len(group)} items for {date}"
+            f"Found {found} items for date range"
         )
-        dest_dir = os.path.join(
-            "data",
-            "json",
-            "projects",
-            f"year_added={date.strftime('%Y')}",
-            f"month_added={date.strftime('%m')}"
-        )
-        dest_filename = f"projects_added_{date.strftime('%Y_%m_%d')}.json"
+        if found != expected:
+            logger.warning(
+                f"Expected {expected} items for date range but found {found}"
+            )
+
+        sinks.finalize()
+    finally:
+        sinks.cleanup()
+
+    return expected, found
+
 
-        os.makedirs(dest_dir, exist_ok=True)
-        with open(os.path.join(dest_dir, dest_filename), "w") as dest:
-            json.dump(group, dest, indent=4)
+def load_first_refresh_cache():
+    return load_json(FIRST_REFRESH_CACHE_PATH, {})
+
+
+def save_first_refresh_cache(cache):
+    atomic_write_json(FIRST_REFRESH_CACHE_PATH, cache)
 
-    
 
 def get_date_of_first_refresh(year):
-    """Walks through dates to find first date where a refresh happened"""
+    """Bisects over the year to find first date where a refresh happened"""
+    cache = load_first_refresh_cache()
+    if str(year) in cache:
+        return datetime.datetime.fromisoformat(cache[str(year)])
+
     logger.info(f"Searching for date of first refresh in {year}")
-    cur_date = datetime.datetime(year=year, month=1, day=1)
-    while cur_date < datetime.datetime(year=year + 1, month=1, day=1):
-        to_date = (
-            cur_date +
-                datetime.timedelta(days=1) -
-                datetime.timedelta(microseconds=1)
+    first_date = datetime.datetime(year=year, month=1, day=1)
+    last_date = datetime.datetime(year=year, month=12, day=31)
+    end_of_day = datetime.timedelta(days=1) - datetime.timedelta(microseconds=1)
+    if not get_total_items(get_date_criteria(first_date, last_date + end_of_day)):
+        return None
+
+    # Shrink [first_date, last_date] while it still contains the first refresh
+    while first_date < last_date:
+        middle = first_date + datetime.timedelta(
+            days=(last_date - first_date).days // 2
         )
-        payload = {
-            "criteria": {
-                "date_added": {
-                    "from_date": cur_date.isoformat(),
-                    "to_date": to_date.isoformat()
-                }
-
-            },
-            "limit": 1
-        }
+        if get_total_items(get_date_criteria(first_date, middle + end_of_day)):
+            last_date = middle
+        else:
+            first_date = middle + datetime.timedelta(days=1)
 
-        response = requests.post(
-            os.path.join(REPORTER_API_URL, "projects", "search"),
-            json=payload
-        )
-        response.raise_for_status()
-        data = response.json()
+    cache[str(year)] = first_date.isoformat()
+    save_first_refresh_cache(cache)
+    return first_date
 
-        if data["meta"]["total"]:
-            return cur_date
-        cur_date += datetime.timedelta(days=1)
 
+def get_data_for_year(year, journal=None):
+    """Walks through a year week by week to download data
 
-def get_data_for_year(year):
-    """Walks through a year week by week to download data"""
+    Given a backfill journal, each week is checkpointed in it with its
+    expected and found counts. A rerun with the same journal skips the
+    weeks that came back complete and retries the rest. Returns the number
+    of records written and the start of each week that came back short.
+    """
     from_date = get_date_of_first_refresh(year)
+    if from_date is None:
+        logger.info(f"No refreshes found in {year}")
+        return 0, []
+
+    n_records = 0
+    short_windows = []
     while from_date < datetime.datetime(year=year + 1, month=1, day=1):
         # Download data a week at a time
         to_date = (
@@ -235,11 +477,261 @@ def get_data_for_year(year):
                 datetime.timedelta(days=7) -
                 datetime.timedelta(microseconds=1)
         )
-        get_items_for_date_range(from_date, to_date)
+        window = None
+        if journal is not None:
+            window = journal["windows"].get(from_date.isoformat())
+        if window is not None and is_window_complete(window):
+            logger.info(
+                f"Skipping completed window from {from_date.isoformat()}"
+                f" with {window['count']} items"
+            )
+        else:
+            expected, found = get_items_for_date_range(from_date, to_date)
+            window = {
+                "to_date": to_date.isoformat(),
+                "expected": expected,
+                "count": found,
+            }
+            if journal is not None:
+                journal["windows"][from_date.isoformat()] = window
+                save_backfill_journal(journal)
+
+        if not is_window_complete(window):
+            short_windows.append(from_date.isoformat())
+        n_records += window["count"]
         from_date += datetime.timedelta(days=7)
 
+    return n_records, short_windows
+
+
+def is_window_complete(window):
+    return window["count"] >= window["expected"]
+
+
+def update_profile_stats():
+    """Refreshes the pruning stats of both copies after they are written"""
+    update_partition_stats(profile["json_root"])
+    update_partition_stats(profile["parquet_root"])
+
+
+def new_backfill_journal(years):
+    return {"years": years, "completed_years": {}, "windows": {}}
+
+
+def load_backfill_journal():
+    return load_json(profile["backfill_journal_path"])
+
+
+def save_backfill_journal(journal):
+    atomic_write_json(profile["backfill_journal_path"], journal)
+
+
+def backfill_years(years, resume=False):
+    """Downloads and converts whole years, newest first
+
+    With resume, the years and windows already in the journal are skipped
+    and the backfill carries on from the window that was interrupted.
+    """
+    journal = load_backfill_journal() if resume else None
+    if journal is None:
+        journal = new_backfill_journal(years)
+        save_backfill_journal(journal)
+    else:
+        years = journal["years"]
+        logger.info(
+            f"Resuming backfill of {len(years)} years with"
+            f" {len(journal['completed_years'])} years and"
+            f" {sum(map(is_window_complete, journal['windows'].values()))}"
+            f" windows already complete"
+        )
+
+    incomplete_years = []
+    for year in years:
+        if str(year) in journal["completed_years"]:
+            logger.info(f"Skipping completed year {year}")
+            continue
+
+        n_records, short_windows = get_data_for_year(year, journal)
+        convert_year(year, profile["json_root"], profile["parquet_root"])
+        update_profile_stats()
+        if short_windows:
+            # Leave the year open so a resume retries the short windows
+            logger.warning(
+                f"{len(short_windows)} windows in {year} came back short,"
+                f" rerun with --resume to retry them"
+            )
+            incomplete_years.append(year)
+            continue
+
+        journal["completed_years"][str(year)] = n_records
+        save_backfill_journal(journal)
+
+    if incomplete_years:
+        logger.warning(f"Backfill incomplete for years {incomplete_years}")
+    else:
+        logger.info(f"Backfill of {len(years)} years complete")
+
+
+def load_sync_state():
+    return load_json(
+        profile["sync_state_path"],
+        {"high_water_mark": None, "days": {}}
+    )
+
+
+def save_sync_state(state):
+    atomic_write_json(profile["sync_state_path"], state)
+
+
+def probe_day(date):
+    """Gets the record count and latest date_added for a single day"""
+    to_date = (
+        date +
+            datetime.timedelta(days=1) -
+            datetime.timedelta(microseconds=1)
+    )
+    payload = {
+        "criteria": get_date_criteria(date, to_date),
+        "sort_field": "date_added",
+        "sort_order": "desc",
+        "include_fields": ["ApplId", "DateAdded"],
+        "limit": 1
+    }
+    data = client.search_projects(payload)
+
+    max_date_added = None
+    if data["results"]:
+        max_date_added = data["results"][0]["date_added"]
+
+    return {
+        "count": data["meta"]["total"],
+        "max_date_added": max_date_added
+    }
+
+
+def sync_incremental(lookback_days=LOOKBACK_DAYS, end_date=None):
+    """Re-downloads only the days whose count or max date_added changed"""
+    state = load_sync_state()
+    if end_date is None:
+        end_date = datetime.datetime.combine(
+            datetime.date.today(),
+            datetime.time()
+        )
+
+    # Start a little before the high-water mark to catch late edits
+    if state["high_water_mark"]:
+        from_date = datetime.datetime.combine(
+            datetime.datetime.fromisoformat(state["high_water_mark"]).date(),
+            datetime.time()
+        ) - datetime.timedelta(days=lookback_days)
+    else:
+        from_date = datetime.datetime(year=end_date.year, month=1, day=1)
+
+    dates = []
+    while from_date <= end_date:
+        dates.append(from_date)
+        from_date += datetime.timedelta(days=1)
+    logger.info(
+        f"Probing {len(dates)} days from {dates[0].strftime('%Y-%m-%d')}"
+        f" to {dates[-1].strftime('%Y-%m-%d')}"
+    )
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        probes = list(executor.map(probe_day, dates))
+
+    changed_years = set()
+    short_days = []
+    for date, probe in zip(dates, probes):
+        key = date.strftime("%Y-%m-%d")
+        if state["days"].get(key, {"count": 0, "max_date_added": None}) == probe:
+            continue
+
+        logger.info(
+            f"Detected change for {key}: {state['days'].get(key)} -> {probe}"
+        )
+        if probe["count"]:
+            expected, found = get_items_for_date_range(
+                date,
+                date + datetime.timedelta(days=1) - datetime.timedelta(microseconds=1)
+            )
+            if found < expected:
+                # Keep the old state so the next sync probes and retries it
+                logger.warning(
+                    f"Expected {expected} items for {key} but found {found},"
+                    f" leaving it for the next sync"
+                )
+                short_days.append(key)
+                continue
+        else:
+            dest_dir, dest_filename = get_day_path(date)
+            if os.path.exists(os.path.join(dest_dir, dest_filename)):
+                os.remove(os.path.join(dest_dir, dest_filename))
+
+        # Save as we go so an interrupted sync keeps its progress
+        changed_years.add(date.year)
+        state["days"][key] = probe
+        # Never move the mark past a short day, or the next sync's
+        # lookback could start after it
+        if not short_days and probe["max_date_added"] and (
+            state["high_water_mark"] is None
+            or probe["max_date_added"] > state["high_water_mark"]
+        ):
+            state["high_water_mark"] = probe["max_date_added"]
+        save_sync_state(state)
+
+    for year in sorted(changed_years):
+        convert_year(year, profile["json_root"], profile["parquet_root"])
+    update_profile_stats()
+
+    if short_days:
+        logger.warning(f"Days to retry on the next sync: {short_days}")
+    logger.info(
+        f"Sync complete, high-water mark is {state['high_water_mark']}"
+    )
+
 
 if __name__ == "__main__":
-    for year in reversed(range(2012, 2026)):
-        get_data_for_year(year)
-        break
+    parser = argparse.ArgumentParser(
+        description="Download project records from NIH RePORTER"
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only re-download days whose counts changed since the last sync"
+    )
+    parser.add_argument(
+        "--lookback-days",
+        type=int,
+        default=LOOKBACK_DAYS,
+        help="days before the high-water mark to re-probe"
+    )
+    parser.add_argument(
+        "--years",
+        nargs=2,
+        type=int,
+        default=[FIRST_BACKFILL_YEAR, LAST_BACKFILL_YEAR],
+        metavar=("FIRST", "LAST"),
+        help="years to backfill, both inclusive"
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="continue an interrupted backfill from its journal"
+    )
+    parser.add_argument(
+        "--profile",
+        choices=sorted(DOWNLOAD_PROFILES),
+        default="full",
+        help="which fields to download and where to keep them"
+    )
+    args = parser.parse_args()
+
+    set_profile(args.profile)
+
+    if args.incremental:
+        sync_incremental(args.lookback_days)
+    else:
+        backfill_years(
+            list(reversed(range(args.years[0], args.years[1] + 1))),
+            args.resume
+        )
@@ -0,0 +1,194 @@
+import argparse
+import duckdb
+import logging
+import os
+
+from checksums import get_file_checksum
+from datetime import datetime
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+INDEX_PATH = os.path.join("/data", "official_lists.duckdb")
+COMBINED_CHANGELOG_PATH = "/public/changelogs/combined/reporter_date_changelog.csv"
+
+
+# FAINs are project numbers without the application type and support year,
+# e.g. 5R01AG063771-05 -> R01AG063771
+FAIN_EXPRESSION = "split_part(ltrim(replace({}, ' ', ''), '123456789'), '-', 1)"
+AWARD_NUMBER_EXPRESSION = "replace({}, ' ', '')"
+
+
+# Tags each changelog row with the earliest list its FAIN appears on
+TAG_QUERY = """
+    WITH first_listed AS (
+        SELECT fain,
+               min(list_date) official_list_date
+        FROM official_index.official_awards
+        GROUP BY fain
+    )
+    SELECT changelog.*,
+           first_listed.official_list_date OFFICIAL_LIST_DATE,
+           changelog.PROJECT_NUM IN (
+               SELECT award_number
+               FROM official_index.official_awards
+               WHERE award_number IS NOT NULL
+           ) AWARD_NUMBER_LISTED
+    FROM read_csv('{}', header=true, all_varchar=true) AS changelog
+    LEFT JOIN first_listed
+      ON first_listed.fain = {}
+    ORDER BY CAST(changelog.APPLICATION_ID AS BIGINT),
+             changelog.FIELD,
+             changelog.DATE_OF_CHANGE
+"""
+
+
+def connect_index(index_path=INDEX_PATH):
+    if os.path.dirname(index_path):
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+    con = duckdb.connect(index_path)
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS official_lists (
+            list_date DATE PRIMARY KEY,
+            source VARCHAR,
+            checksum VARCHAR,
+            n_entries BIGINT
+        )
+        """
+    )
+    con.execute(
+        """
+        CREATE TABLE IF NOT EXISTS official_awards (
+            list_date DATE,
+            fain VARCHAR,
+            award_number VARCHAR
+        )
+        """
+    )
+    con.execute(
+        """
+        CREATE INDEX IF NOT EXISTS official_awards_fain
+        ON official_awards (fain)
+        """
+    )
+
+    return con
+
+
+def get_list_relation(path):
+    """Reads a plain FAIN list or a table with fain/award_number columns"""
+    if path.endswith(".txt"):
+        return (
+            f"(SELECT {FAIN_EXPRESSION.format('column0')} fain,"
+            " NULL award_number"
+            f" FROM read_csv('{path}', header=false, columns={{'column0': 'VARCHAR'}}))"
+        )
+
+    return (
+        f"(SELECT {FAIN_EXPRESSION.format('fain')} fain,"
+        f" {AWARD_NUMBER_EXPRESSION.format('award_number')} award_number"
+        f" FROM read_csv('{path}', header=true, all_varchar=true))"
+    )
+
+
+def add_list(list_date, path, index_path=INDEX_PATH):
+    """Indexes an official list, skipping it if it is already up to date"""
+    checksum = get_file_checksum(path)
+    con = connect_index(index_path)
+    existing = con.execute(
+        "SELECT checksum FROM official_lists WHERE list_date = ?",
+        [list_date.date()]
+    ).fetchone()
+    if existing and existing[0] == checksum:
+        logger.info(
+            f"List for {list_date.strftime('%Y-%m-%d')} already indexed. Skipping..."
+        )
+        con.close()
+        return
+
+    logger.info(
+        f"Indexing list for {list_date.strftime('%Y-%m-%d')} from {path}"
+    )
+    con.execute("BEGIN TRANSACTION")
+    con.execute(
+        "DELETE FROM official_awards WHERE list_date = ?",
+        [list_date.date()]
+    )
+    con.execute(
+        "DELETE FROM official_lists WHERE list_date = ?",
+        [list_date.date()]
+    )
+    con.execute(
+        f"""
+        INSERT INTO official_awards
+        SELECT DISTINCT DATE '{list_date.strftime('%Y-%m-%d')}',
+               fain,
+               award_number
+        FROM {get_list_relation(path)}
+        WHERE fain != ''
+        """
+    )
+    con.execute(
+        f"""
+        INSERT INTO official_lists
+        SELECT DATE '{list_date.strftime('%Y-%m-%d')}',
+               '{path}',
+               '{checksum}',
+               count(*)
+        FROM official_awards
+        WHERE list_date = DATE '{list_date.strftime('%Y-%m-%d')}'
+        """
+    )
+    con.execute("COMMIT")
+    con.close()
+
+
+def tag_changelog(
+    dest_path,
+    changelog_path=COMBINED_CHANGELOG_PATH,
+    index_path=INDEX_PATH
+):
+    """Writes the changelog with the earliest official list per row"""
+    logger.info(f"Tagging {changelog_path}")
+    con = duckdb.connect()
+    con.execute(
+        f"ATTACH '{index_path}' AS official_index (READ_ONLY)"
+    )
+    con.execute(
+        f"""
+        COPY (
+            {TAG_QUERY.format(changelog_path, FAIN_EXPRESSION.format('changelog.PROJECT_NUM'))}
+        ) TO '{dest_path}' (HEADER, DELIMITER ',')
+        """
+    )
+    con.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Match changelog rows against official termination lists"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = subparsers.add_parser("add", help="index an official list")
+    add_parser.add_argument("list_date", type=datetime.fromisoformat)
+    add_parser.add_argument(
+        "path",
+        help="text file of FAINs or CSV with fain and award_number columns"
+    )
+
+    tag_parser = subparsers.add_parser("tag", help="tag a changelog")
+    tag_parser.add_argument("dest_path")
+    tag_parser.add_argument("--changelog", default=COMBINED_CHANGELOG_PATH)
+
+    parser.add_argument("--index-path", default=INDEX_PATH)
+    args = parser.parse_args()
+
+    if args.command == "add":
+        add_list(args.list_date, args.path, args.index_path)
+    else:
+        tag_changelog(args.dest_path, args.changelog, args.index_path)
@@ -0,0 +1,131 @@
+import argparse
+import duckdb
+import logging
+import pandas as pd
+
+from catalog import get_analysis_source
+from datetime import datetime
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+RENEWALS_ADDED_FROM = datetime(2015, 1, 1)
+
+
+# Non-competitive yearly renewals that were added before any cutoff
+RENEWALS_QUERY = """
+    CREATE TEMP TABLE renewals AS
+    SELECT appl_id,
+           str_split(project_num, '-')[1][2:] project_num_prefix,
+           fiscal_year,
+           award_amount,
+           project_end_date,
+           budget_end,
+           date_added
+    FROM {}
+    WHERE year_added >= 2015
+      AND project_num_split.appl_type_code = '5'
+      AND budget_end IS NOT NULL
+"""
+
+
+# A project has lapsed at a cutoff when some of its entries ended by the
+# cutoff, none are funded past it, and the project itself has not ended.
+# Every cutoff is handled in one range join instead of a loop.
+LAPSED_QUERY = """
+    WITH per_project AS (
+        SELECT cutoffs.cutoff_date,
+               renewals.project_num_prefix,
+               max(renewals.project_end_date) project_end_date,
+               count(*) FILTER (renewals.budget_end <= cutoffs.cutoff_date) n_lapsed_entries,
+               sum(renewals.award_amount) FILTER (renewals.budget_end <= cutoffs.cutoff_date) sum_lapsed_entries,
+               count(*) FILTER (renewals.budget_end >= cutoffs.cutoff_date) n_funded_entries
+        FROM cutoffs
+        INNER JOIN renewals
+          ON renewals.date_added < cutoffs.cutoff_date
+         AND renewals.fiscal_year >= year(cutoffs.cutoff_date) - 1
+        GROUP BY cutoffs.cutoff_date, renewals.project_num_prefix
+    )
+    SELECT cutoffs.cutoff_date cutoff_dates,
+           year(cutoffs.cutoff_date) "year",
+           count(per_project.project_num_prefix) n_lapsed,
+           coalesce(sum(per_project.sum_lapsed_entries), 0) lapsed_award_amount_total
+    FROM cutoffs
+    LEFT JOIN per_project
+      ON per_project.cutoff_date = cutoffs.cutoff_date
+     AND per_project.n_lapsed_entries > 0
+     AND per_project.n_funded_entries = 0
+     AND per_project.project_end_date > per_project.cutoff_date
+    GROUP BY cutoffs.cutoff_date
+    ORDER BY cutoffs.cutoff_date DESC
+"""
+
+
+def get_lapsed_statistics(cutoff_dates, data_date=None):
+    """Counts lapsed renewals and their award totals for every cutoff"""
+    con = duckdb.connect()
+    con.execute(
+        RENEWALS_QUERY.format(
+            get_analysis_source(
+                data_date,
+                con,
+                added_from=RENEWALS_ADDED_FROM
+            )
+        )
+    )
+
+    cutoffs = pd.DataFrame({"cutoff_date": pd.to_datetime(cutoff_dates)})
+    con.register("cutoffs", cutoffs)
+    data = con.execute(LAPSED_QUERY).df()
+    con.close()
+
+    return data
+
+
+def get_weekly_cutoffs(start_date, end_date):
+    return list(pd.date_range(start_date, end_date, freq="7D"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compute lapsed non-competitive renewals per cutoff date"
+    )
+    parser.add_argument(
+        "dest_file",
+        help="CSV file to write the statistics to"
+    )
+    parser.add_argument(
+        "cutoff_dates",
+        nargs="*",
+        type=datetime.fromisoformat,
+        help="cutoff dates to evaluate"
+    )
+    parser.add_argument(
+        "--weekly",
+        nargs=2,
+        type=datetime.fromisoformat,
+        metavar=("START", "END"),
+        help="evaluate every week between two dates instead"
+    )
+    parser.add_argument(
+        "--date",
+        type=datetime.fromisoformat,
+        default=None,
+        help="snapshot to use, defaults to the current download"
+    )
+    args = parser.parse_args()
+
+    cutoff_dates = args.cutoff_dates
+    if args.weekly:
+        cutoff_dates = get_weekly_cutoffs(*args.weekly)
+    if not cutoff_dates:
+        parser.error("no cutoff dates given")
+
+    logger.info(f"Computing lapse statistics for {len(cutoff_dates)} cutoffs")
+    get_lapsed_statistics(cutoff_dates, args.date).to_csv(
+        args.dest_file,
+        index=False
+    )
@@ -0,0 +1,21 @@
+import json
+import os
+
+
+def load_json(path, default=None):
+    """Contents of a JSON file, or default if it has not been written yet"""
+    if not os.path.exists(path):
+        return default
+
+    with open(path) as src:
+        return json.load(src)
+
+
+def atomic_write_json(path, obj):
+    """Writes JSON through a temporary file so readers never see it half done"""
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + ".tmp", "w") as dest:
+        json.dump(obj, dest, indent=4, sort_keys=True)
+
+    os.replace(path + ".tmp", path)
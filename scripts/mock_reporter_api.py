@@ -0,0 +1,344 @@
+import argparse
+import bisect
+import datetime
+import json
+import logging
+import random
+import threading
+import time
+
+from glob import glob
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from reporter_client import get_api_field_name
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+SEARCH_PATH = "/v2/projects/search"
+STATS_PATH = "/stats"
+# Same paging cap as the live API
+MAX_OFFSET = 14999
+MAX_LIMIT = 500
+DEFAULT_LIMIT = 50
+ERROR_STATUS_CODES = [429, 500, 502, 503, 504]
+
+
+def generate_records(n_records, from_date, to_date, seed=0):
+    """Builds synthetic project records spread over a date_added range"""
+    rng = random.Random(seed)
+    span = (to_date - from_date).total_seconds()
+    records = []
+    for ind in range(n_records):
+        date_added = from_date + datetime.timedelta(
+            seconds=int(rng.uniform(0, span))
+        )
+        fiscal_year = date_added.year + (date_added.month >= 10)
+        records.append({
+            "appl_id": 10000000 + ind,
+            "fiscal_year": rng.choice([fiscal_year, fiscal_year, fiscal_year - 1]),
+            "project_num": f"5R01AG{ind:06d}-0{rng.randint(1, 9)}",
+            "core_project_num": f"R01AG{ind:06d}",
+            "project_num_split": {
+                "appl_type_code": "5",
+                "activity_code": "R01",
+                "ic_code": "AG",
+                "serial_num": f"{ind:06d}",
+                "support_year": "01",
+                "full_support_year": "01",
+                "suffix_code": None,
+            },
+            "activity_code": "R01",
+            "organization": {
+                "org_name": f"SYNTHETIC ORGANIZATION {rng.randint(1, 500)}",
+                "city": None,
+                "country": None,
+                "org_city": "SEATTLE",
+                "org_country": "UNITED STATES",
+                "org_state": "WA",
+                "org_state_name": None,
+                "dept_type": "BIOCHEMISTRY",
+                "fips_country_code": None,
+                "org_duns": ["605799469"],
+                "org_ueis": ["HD1WMN6945W6"],
+                "primary_duns": "605799469",
+                "primary_uei": "HD1WMN6945W6",
+                "org_fips": "US",
+                "org_ipf_code": "4962501",
+                "org_zipcode": "981951016",
+                "external_org_id": 4962501,
+            },
+            "award_notice_date": f"{fiscal_year - 1}-08-15T00:00:00",
+            "award_amount": rng.randint(50000, 2000000),
+            "project_start_date": f"{fiscal_year - 3}-09-01T00:00:00",
+            "project_end_date": f"{fiscal_year + 2}-08-31T00:00:00",
+            "budget_start": f"{fiscal_year - 1}-09-01T00:00:00",
+            "budget_end": f"{fiscal_year}-08-31T00:00:00",
+            "project_title": f"Synthetic project {ind}",
+            "abstract_text": "Lorem ipsum dolor sit amet. " * rng.randint(20, 80),
+            "date_added": date_added.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+
+    return records
+
+
+def load_fixture_records(path_glob):
+    """Loads records from downloaded project JSON files"""
+    records = []
+    for path in sorted(glob(path_glob)):
+        with open(path) as src:
+            records.extend(json.load(src))
+
+    return records
+
+
+def project_fields(records, include_fields=None, exclude_fields=None):
+    """Applies include_fields/exclude_fields the way the API does"""
+    if not include_fields and not exclude_fields:
+        return records
+
+    include_fields = set(include_fields or [])
+    exclude_fields = set(exclude_fields or [])
+    return [
+        {
+            key: value for key, value in record.items()
+            if (not include_fields or get_api_field_name(key) in include_fields)
+            and get_api_field_name(key) not in exclude_fields
+        }
+        for record in records
+    ]
+
+
+def parse_api_date(value):
+    return datetime.datetime.fromisoformat(value.rstrip("Z"))
+
+
+class ProjectIndex:
+    """Keeps records ordered by date_added for fast range lookups"""
+
+    def __init__(self, records):
+        self.records = sorted(
+            records,
+            key=lambda record: (record["date_added"], record["appl_id"])
+        )
+        self.dates = [
+            parse_api_date(record["date_added"]) for record in self.records
+        ]
+
+    def search(self, criteria):
+        start, stop = 0, len(self.records)
+        date_added = criteria.get("date_added")
+        if date_added:
+            if date_added.get("from_date"):
+                start = bisect.bisect_left(
+                    self.dates,
+                    parse_api_date(date_added["from_date"])
+                )
+            if date_added.get("to_date"):
+                stop = bisect.bisect_right(
+                    self.dates,
+                    parse_api_date(date_added["to_date"])
+                )
+
+        records = self.records[start:stop]
+        fiscal_years = criteria.get("fiscal_years")
+        if fiscal_years:
+            fiscal_years = set(fiscal_years)
+            records = [
+                record for record in records
+                if record["fiscal_year"] in fiscal_years
+            ]
+
+        return records
+
+
+class MockReporterServer(ThreadingHTTPServer):
+    """Serves POST /v2/projects/search from an in-memory index"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        records,
+        latency=0.,
+        jitter=0.,
+        error_rate=0.,
+        retry_after=None,
+        seed=0
+    ):
+        super().__init__(address, MockReporterHandler)
+        self.index = ProjectIndex(records)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "records_served": 0,
+        }
+
+    def record(self, key, count=1):
+        with self.lock:
+            self.stats[key] += count
+
+    def get_delay(self):
+        with self.lock:
+            return self.latency + self.rng.uniform(0, self.jitter)
+
+    def should_fail(self):
+        with self.lock:
+            if self.rng.random() >= self.error_rate:
+                return None
+            return self.rng.choice(ERROR_STATUS_CODES)
+
+
+class MockReporterHandler(BaseHTTPRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != STATS_PATH:
+            self.send_json(404, {"error": "not found"})
+            return
+
+        with self.server.lock:
+            self.send_json(200, dict(self.server.stats))
+
+    def do_POST(self):
+        if self.path != SEARCH_PATH:
+            self.send_json(404, {"error": "not found"})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        self.server.record("requests")
+        time.sleep(self.server.get_delay())
+
+        status = self.server.should_fail()
+        if status is not None:
+            self.server.record("errors")
+            headers = {}
+            if status == 429 and self.server.retry_after is not None:
+                headers["Retry-After"] = str(self.server.retry_after)
+            self.send_json(status, {"error": "injected failure"}, headers)
+            return
+
+        offset = payload.get("offset", 0)
+        limit = payload.get("limit", DEFAULT_LIMIT)
+        if offset > MAX_OFFSET or limit > MAX_LIMIT:
+            self.send_json(400, {
+                "error": f"offset must be at most {MAX_OFFSET}"
+                         f" and limit at most {MAX_LIMIT}"
+            })
+            return
+
+        records = self.server.index.search(payload.get("criteria", {}))
+        sort_field = payload.get("sort_field")
+        if sort_field:
+            records = sorted(
+                records,
+                key=lambda record: record[sort_field],
+                reverse=payload.get("sort_order") == "desc"
+            )
+
+        results = project_fields(
+            records[offset:offset + limit],
+            payload.get("include_fields"),
+            payload.get("exclude_fields")
+        )
+        self.server.record("records_served", len(results))
+        self.send_json(200, {
+            "meta": {
+                "search_id": None,
+                "total": len(records),
+                "offset": offset,
+                "limit": limit,
+                "sort_field": sort_field,
+                "sort_order": payload.get("sort_order", "asc"),
+            },
+            "results": results
+        })
+
+
+def serve(server):
+    """Runs a server on a daemon thread and returns its base URL"""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address[:2]
+
+    return f"http://{host}:{port}/v2/"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve a local stand-in for the RePORTER projects API"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--fixture",
+        help="glob of downloaded project JSON files to serve"
+    )
+    parser.add_argument(
+        "--n-records",
+        type=int,
+        default=50000,
+        help="synthetic records to serve when no fixture is given"
+    )
+    parser.add_argument(
+        "--from-date",
+        type=datetime.datetime.fromisoformat,
+        default=datetime.datetime(2025, 1, 1)
+    )
+    parser.add_argument(
+        "--to-date",
+        type=datetime.datetime.fromisoformat,
+        default=datetime.datetime(2025, 4, 1)
+    )
+    parser.add_argument("--latency", type=float, default=0.)
+    parser.add_argument("--jitter", type=float, default=0.)
+    parser.add_argument("--error-rate", type=float, default=0.)
+    parser.add_argument("--retry-after", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.fixture:
+        records = load_fixture_records(args.fixture)
+    else:
+        records = generate_records(
+            args.n_records,
+            args.from_date,
+            args.to_date,
+            args.seed
+        )
+
+    server = MockReporterServer(
+        (args.host, args.port),
+        records,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    logger.info(
+        f"Serving {len(records)} records on http://{args.host}:{args.port}/v2/"
+    )
+    server.serve_forever()
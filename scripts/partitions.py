@@ -0,0 +1,233 @@
+import argparse
+import duckdb
+import logging
+import os
+
+from convert_to_parquet import (
+    PARTITION_TYPES,
+    PROJECT_COLUMNS,
+    format_paths,
+    format_struct,
+    read_json_projects,
+    read_parquet_projects
+)
+from datetime import datetime
+from glob import glob
+from json_files import atomic_write_json, load_json
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+STATS_FILENAME = "partition_stats.json"
+STATS_COLUMNS = {
+    "date_added": "TIMESTAMP",
+    "fiscal_year": "INTEGER",
+}
+
+
+# Only the columns used for pruning are parsed when gathering stats
+STATS_QUERY = """
+    SELECT filename,
+           count(*) n_records,
+           strftime(min(date_added), '%Y-%m-%d %H:%M:%S') min_date_added,
+           strftime(max(date_added), '%Y-%m-%d %H:%M:%S') max_date_added,
+           min(fiscal_year) min_fiscal_year,
+           max(fiscal_year) max_fiscal_year
+    FROM {}
+    GROUP BY filename
+"""
+
+
+def list_partition_files(root):
+    return sorted(
+        glob(os.path.join(root, "year_added=*", "month_added=*", "*.json"))
+        + glob(os.path.join(root, "year_added=*", "month_added=*", "*.parquet"))
+    )
+
+
+def get_stats_relation(paths):
+    if paths[0].endswith(".parquet"):
+        return f"read_parquet({format_paths(paths)}, filename=true)"
+
+    return (
+        f"read_json({format_paths(paths)},"
+        f" format='array',"
+        f" filename=true,"
+        f" columns={format_struct(STATS_COLUMNS)})"
+    )
+
+
+def load_partition_stats(root):
+    return load_json(os.path.join(root, STATS_FILENAME), {})
+
+
+def save_partition_stats(root, stats):
+    atomic_write_json(os.path.join(root, STATS_FILENAME), stats)
+
+
+def is_stats_current(entry, file_stat):
+    return (
+        entry is not None
+        and entry["size"] == file_stat.st_size
+        and entry["mtime"] == file_stat.st_mtime
+    )
+
+
+def update_partition_stats(root):
+    """Refreshes min/max stats for files that are new or have changed
+
+    Called by whatever writes the files under root; queries only read the
+    stats, so frozen and read-only trees are never written to.
+    """
+    stats = load_partition_stats(root)
+    current = {}
+    stale = []
+    for path in list_partition_files(root):
+        name = os.path.relpath(path, root)
+        file_stat = os.stat(path)
+        entry = stats.get(name)
+        if not is_stats_current(entry, file_stat):
+            stale.append(path)
+            entry = {
+                "size": file_stat.st_size,
+                "mtime": file_stat.st_mtime,
+                "n_records": 0,
+                "min_date_added": None,
+                "max_date_added": None,
+                "min_fiscal_year": None,
+                "max_fiscal_year": None,
+            }
+        current[name] = entry
+
+    if not stale and current.keys() == stats.keys():
+        return current
+
+    if stale:
+        logger.info(f"Gathering stats for {len(stale)} files under {root}")
+        rows = duckdb.execute(
+            STATS_QUERY.format(get_stats_relation(stale))
+        ).fetchall()
+        for filename, *values in rows:
+            current[os.path.relpath(filename, root)].update(zip(
+                [
+                    "n_records",
+                    "min_date_added",
+                    "max_date_added",
+                    "min_fiscal_year",
+                    "max_fiscal_year",
+                ],
+                values
+            ))
+
+    save_partition_stats(root, current)
+    return current
+
+
+def select_partition_files(
+    root,
+    added_from=None,
+    added_to=None,
+    fiscal_years=None
+):
+    """Lists the files that can hold records in the requested ranges
+
+    Dates added are compared by day and both ends are inclusive, as are
+    the first and last fiscal years. Files without current stats cannot
+    be pruned, so they are always listed.
+    """
+    stats = load_partition_stats(root)
+    selected = []
+    unpruned = 0
+    for path in list_partition_files(root):
+        entry = stats.get(os.path.relpath(path, root))
+        if not is_stats_current(entry, os.stat(path)):
+            unpruned += 1
+            selected.append(path)
+            continue
+        if not entry["n_records"]:
+            continue
+        if (
+            added_from is not None
+            and entry["max_date_added"][:10] < added_from.strftime("%Y-%m-%d")
+        ):
+            continue
+        if (
+            added_to is not None
+            and entry["min_date_added"][:10] > added_to.strftime("%Y-%m-%d")
+        ):
+            continue
+        if fiscal_years is not None and (
+            entry["max_fiscal_year"] is None
+            or entry["max_fiscal_year"] < fiscal_years[0]
+            or entry["min_fiscal_year"] > fiscal_years[1]
+        ):
+            continue
+
+        selected.append(path)
+
+    if unpruned:
+        logger.warning(
+            f"{unpruned} files under {root} have no current stats and are"
+            f" scanned in full, run partitions.py --update to build them"
+        )
+    return selected
+
+
+def get_empty_relation():
+    """A relation with the project schema and no rows"""
+    columns = {**PROJECT_COLUMNS, **PARTITION_TYPES}
+    return "(SELECT " + ", ".join(
+        f"CAST(NULL AS {' '.join(dtype.split())}) {name}"
+        for name, dtype in columns.items()
+    ) + " LIMIT 0)"
+
+
+def get_pruned_relation(
+    root,
+    added_from=None,
+    added_to=None,
+    fiscal_years=None
+):
+    """Builds a scan over only the partition files a query needs"""
+    paths = select_partition_files(root, added_from, added_to, fiscal_years)
+    logger.info(f"Scanning {len(paths)} files under {root}")
+    if not paths:
+        return get_empty_relation()
+    if paths[0].endswith(".parquet"):
+        return read_parquet_projects(paths)
+
+    return read_json_projects(paths)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="List the partition files holding a date or fiscal year range"
+    )
+    parser.add_argument("root", help="hive partitioned JSON or Parquet root")
+    parser.add_argument("--added-from", type=datetime.fromisoformat)
+    parser.add_argument("--added-to", type=datetime.fromisoformat)
+    parser.add_argument(
+        "--fiscal-years",
+        nargs=2,
+        type=int,
+        metavar=("FIRST", "LAST")
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="build or refresh the stats file under root before listing"
+    )
+    args = parser.parse_args()
+
+    if args.update:
+        update_partition_stats(args.root)
+    for path in select_partition_files(
+        args.root,
+        args.added_from,
+        args.added_to,
+        args.fiscal_years
+    ):
+        print(path)
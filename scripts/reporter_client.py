@@ -0,0 +1,156 @@
+import email.utils
+import logging
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+REPORTER_API_URL = os.environ.get(
+    "REPORTER_API_URL",
+    "https://api.reporter.nih.gov/v2/"
+)
+MAX_RETRIES = int(os.environ.get("REPORTER_MAX_RETRIES", 5))
+BACKOFF_FACTOR = float(os.environ.get("REPORTER_BACKOFF_FACTOR", 1.0))
+MAX_BACKOFF = float(os.environ.get("REPORTER_MAX_BACKOFF", 60.0))
+# RePORTER asks for no more than one request per second
+REQUESTS_PER_SECOND = float(os.environ.get("REPORTER_REQUESTS_PER_SECOND", 1.0))
+POOL_SIZE = int(os.environ.get("REPORTER_POOL_SIZE", 8))
+TIMEOUT = float(os.environ.get("REPORTER_TIMEOUT", 120.0))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class RateLimiter:
+    """Spaces out request start times across all threads"""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1. / requests_per_second if requests_per_second else 0.
+        self.next_time = 0.
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds):
+        # Hold back every thread, e.g. when the server sends Retry-After
+        with self.lock:
+            self.next_time = max(self.next_time, time.monotonic() + seconds)
+
+
+def get_api_field_name(field):
+    # The API names fields in PascalCase, e.g. appl_id -> ApplId
+    return "".join(part.capitalize() for part in field.split("_"))
+
+
+def parse_retry_after(response):
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.)
+    except ValueError:
+        pass
+
+    try:
+        retry_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_date.timestamp() - time.time(), 0.)
+
+
+class ReporterClient:
+    """Shared, pooled session for the RePORTER API with retries"""
+
+    def __init__(
+        self,
+        base_url=REPORTER_API_URL,
+        max_retries=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        max_backoff=MAX_BACKOFF,
+        requests_per_second=REQUESTS_PER_SECOND,
+        pool_size=POOL_SIZE,
+        timeout=TIMEOUT,
+        decode=None
+    ):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        # Parses raw response bytes, e.g. with a faster JSON library
+        self.decode = decode
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+        # Keep connections alive and allow one per worker thread
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate"
+        })
+
+    def get_backoff(self, attempt):
+        # Exponential backoff with full jitter
+        return random.uniform(
+            0,
+            min(self.max_backoff, self.backoff_factor * 2 ** attempt)
+        )
+
+    def post(self, path, payload):
+        url = self.base_url.rstrip("/") + "/" + path.lstrip("/")
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            try:
+                response = self.session.post(
+                    url,
+                    json=payload,
+                    timeout=self.timeout
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.get_backoff(attempt)
+                logger.warning(
+                    f"Request to {url} failed ({e}), retrying in {delay:.1f}s"
+                )
+                time.sleep(delay)
+                continue
+
+            if (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt == self.max_retries
+            ):
+                response.raise_for_status()
+                if self.decode is not None:
+                    return self.decode(response.content)
+                return response.json()
+
+            retry_after = parse_retry_after(response)
+            if retry_after is not None:
+                delay = min(retry_after, self.max_backoff)
+                self.rate_limiter.pause(delay)
+            else:
+                delay = self.get_backoff(attempt)
+            logger.warning(
+                f"Received {response.status_code} from {url}, "
+                f"retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+    def search_projects(self, payload):
+        return self.post("projects/search", payload)
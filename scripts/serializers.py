@@ -0,0 +1,193 @@
+import json
+import os
+
+from convert_to_parquet import PROJECT_COLUMNS
+from reporter_client import get_api_field_name
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Fastest available backend is used unless one is named here
+SERIALIZER = os.environ.get("REPORTER_SERIALIZER")
+PREFERRED_SERIALIZERS = ["msgspec", "orjson", "json"]
+# Dates stay strings so they are written back exactly as the API sent them
+SCALAR_TYPES = {
+    "BIGINT": int,
+    "INTEGER": int,
+    "DOUBLE": float,
+    "BOOLEAN": bool,
+    "VARCHAR": str,
+    "DATE": str,
+    "TIMESTAMP": str,
+}
+
+
+if msgspec is not None:
+
+    class ReporterStruct(msgspec.Struct):
+        """Base for API records, readable like the dicts json returns"""
+
+        def __getitem__(self, key):
+            return getattr(self, key)
+
+
+def split_fields(struct_body):
+    """Splits the fields of a DuckDB STRUCT(...) on top level commas"""
+    fields, depth, start = [], 0, 0
+    for ind, char in enumerate(struct_body):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            fields.append(struct_body[start:ind].strip())
+            start = ind + 1
+    fields.append(struct_body[start:].strip())
+
+    return [field.split(" ", 1) for field in fields]
+
+
+def get_field_type(name, dtype):
+    """Translates a PROJECT_COLUMNS type into a nullable msgspec type"""
+    dtype = " ".join(dtype.split())
+    if dtype.endswith("[]"):
+        field_type = list[get_field_type(name, dtype[:-2])]
+    elif dtype.startswith("STRUCT("):
+        field_type = msgspec.defstruct(
+            get_api_field_name(name),
+            [
+                (field, get_field_type(field, field_dtype), None)
+                for field, field_dtype in split_fields(dtype[7:-1])
+            ],
+            bases=(ReporterStruct,)
+        )
+    else:
+        field_type = SCALAR_TYPES[dtype]
+
+    return field_type | None
+
+
+def get_page_type(fields):
+    """Builds a typed search response holding only the given fields"""
+    unknown = set(fields) - set(PROJECT_COLUMNS)
+    if unknown:
+        raise ValueError(f"No column types for fields {sorted(unknown)}")
+
+    project = msgspec.defstruct(
+        "Project",
+        [
+            (field, get_field_type(field, PROJECT_COLUMNS[field]), None)
+            for field in fields
+        ],
+        bases=(ReporterStruct,)
+    )
+    meta = msgspec.defstruct(
+        "PageMeta",
+        [("total", int)],
+        bases=(ReporterStruct,)
+    )
+
+    return msgspec.defstruct(
+        "Page",
+        [("meta", meta), ("results", list[project], [])],
+        bases=(ReporterStruct,)
+    )
+
+
+class JsonSerializer:
+    """Standard library fallback, always decodes to dicts"""
+
+    name = "json"
+
+    def __init__(self, fields=None):
+        pass
+
+    def decode_page(self, data):
+        return json.loads(data)
+
+    def encode_lines(self, records):
+        return "".join(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for record in records
+        ).encode()
+
+
+class OrjsonSerializer:
+    """Decodes pages to dicts with orjson"""
+
+    name = "orjson"
+
+    def __init__(self, fields=None):
+        pass
+
+    def decode_page(self, data):
+        return orjson.loads(data)
+
+    def encode_lines(self, records):
+        return b"".join(
+            orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+            for record in records
+        )
+
+
+class MsgspecSerializer:
+    """Decodes pages to dicts, or to typed structs when fields are given
+
+    Typed decoding keeps only the listed fields, so it is only used for
+    profiles that ask the API for exactly those. A page that does not fit
+    the column types raises a msgspec.ValidationError.
+    """
+
+    name = "msgspec"
+
+    def __init__(self, fields=None):
+        if fields:
+            self.decoder = msgspec.json.Decoder(get_page_type(fields))
+        else:
+            self.decoder = msgspec.json.Decoder()
+        self.encoder = msgspec.json.Encoder()
+
+    def decode_page(self, data):
+        return self.decoder.decode(data)
+
+    def encode_lines(self, records):
+        return self.encoder.encode_lines(records)
+
+
+SERIALIZERS = {
+    "msgspec": MsgspecSerializer,
+    "orjson": OrjsonSerializer,
+    "json": JsonSerializer,
+}
+
+
+def list_serializers():
+    """Names of the backends whose packages are installed"""
+    installed = {
+        "msgspec": msgspec is not None,
+        "orjson": orjson is not None,
+        "json": True,
+    }
+    return [name for name in PREFERRED_SERIALIZERS if installed[name]]
+
+
+def get_serializer(name=None, fields=None):
+    """Picks a backend; fields opts into typed records where supported"""
+    name = name or SERIALIZER
+    available = list_serializers()
+    if name is None:
+        name = available[0]
+    if name not in available:
+        raise ValueError(
+            f"Serializer {name} is not available, choose from {available}"
+        )
+
+    return SERIALIZERS[name](fields)
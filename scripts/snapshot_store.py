@@ -0,0 +1,236 @@
+import argparse
+import duckdb
+import logging
+import os
+import shutil
+
+from convert_to_parquet import read_json_projects
+from datetime import datetime
+from glob import glob
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+STORE_ROOT = os.path.join("/data", "store")
+# Fields the date changelog compares between snapshots
+TRACKED_FIELDS = [
+    "project_start_date",
+    "project_end_date",
+    "budget_start",
+    "budget_end",
+]
+# Columns the changelog reports next to each change, kept in the manifest
+# with the tracked fields so snapshots can be diffed without the records
+CHANGELOG_COLUMNS = {
+    "core_project_num": "core_project_num",
+    "project_num": "project_num",
+    "fiscal_year": "fiscal_year",
+    "org_name": "organization.org_name",
+    "org_country": "organization.org_country",
+}
+
+
+def get_fingerprint_expression():
+    """Hashes the tracked date fields of a record"""
+    return "md5(concat_ws('|', " + ", ".join(
+        f"coalesce(CAST(CAST({field} AS DATE) AS VARCHAR), '')"
+        for field in TRACKED_FIELDS
+    ) + "))"
+
+
+def get_changelog_columns():
+    return ", ".join(
+        [
+            f"{expression} {name}"
+            for name, expression in CHANGELOG_COLUMNS.items()
+        ]
+        + [f"CAST({field} AS DATE) {field}" for field in TRACKED_FIELDS]
+    )
+
+
+def get_records_glob(store_root=STORE_ROOT):
+    return os.path.join(store_root, "records", "*.parquet")
+
+
+def get_manifest_path(data_date, store_root=STORE_ROOT):
+    return os.path.join(
+        store_root,
+        "manifests",
+        f"snapshot_{data_date.strftime('%Y_%m_%d')}.parquet"
+    )
+
+
+def has_snapshot(data_date, store_root=STORE_ROOT):
+    return os.path.exists(get_manifest_path(data_date, store_root))
+
+
+def has_changelog_columns(data_date, store_root=STORE_ROOT):
+    """Whether a manifest predates the changelog columns being stored"""
+    names = {
+        row[0] for row in duckdb.execute(
+            f"""
+            SELECT name
+            FROM parquet_schema('{get_manifest_path(data_date, store_root)}')
+            """
+        ).fetchall()
+    }
+    return names.issuperset(list(CHANGELOG_COLUMNS) + TRACKED_FIELDS)
+
+
+def parse_snapshot_dir(path, prefix):
+    """Date of a prefix_YYYY_MM_DD snapshot copy, None for other names"""
+    try:
+        return datetime.strptime(os.path.basename(path), f"{prefix}_%Y_%m_%d")
+    except ValueError:
+        return None
+
+
+def list_snapshots(store_root=STORE_ROOT):
+    return sorted(
+        datetime.strptime(os.path.basename(path), "snapshot_%Y_%m_%d.parquet")
+        for path in glob(os.path.join(store_root, "manifests", "*.parquet"))
+    )
+
+
+def ingest_snapshot(data_date, source_root=None, store_root=STORE_ROOT):
+    """Adds a JSON snapshot to the store, keeping only unseen records"""
+    if source_root is None:
+        source_root = f"/data/json_{data_date.strftime('%Y_%m_%d')}/projects"
+    manifest_path = get_manifest_path(data_date, store_root)
+    if os.path.exists(manifest_path):
+        logger.info(
+            f"Snapshot {data_date.strftime('%Y-%m-%d')} already in store. Skipping..."
+        )
+        return
+
+    logger.info(
+        f"Ingesting snapshot {data_date.strftime('%Y-%m-%d')} from {source_root}"
+    )
+    os.makedirs(os.path.join(store_root, "records"), exist_ok=True)
+    os.makedirs(os.path.join(store_root, "manifests"), exist_ok=True)
+
+    con = duckdb.connect()
+    con.execute(
+        f"""
+        CREATE TEMP TABLE incoming AS
+        SELECT md5(to_json(p)) record_hash,
+               p.*
+        FROM (
+            SELECT * EXCLUDE (year_added, month_added)
+            FROM {read_json_projects(os.path.join(source_root, "*", "*", "*.json"))}
+        ) p
+        """
+    )
+
+    # Records are keyed by appl_id plus the hash of their content
+    if glob(get_records_glob(store_root)):
+        con.execute(
+            f"""
+            CREATE TEMP TABLE new_records AS
+            SELECT *
+            FROM incoming
+            ANTI JOIN (
+                SELECT appl_id, record_hash
+                FROM read_parquet('{get_records_glob(store_root)}')
+            ) AS stored
+              USING (appl_id, record_hash)
+            """
+        )
+    else:
+        con.execute("CREATE TEMP TABLE new_records AS SELECT * FROM incoming")
+
+    n_new, = con.execute("SELECT count(*) FROM new_records").fetchone()
+    n_total, = con.execute("SELECT count(*) FROM incoming").fetchone()
+    logger.info(f"Found {n_new} new records out of {n_total}")
+    if n_new:
+        records_path = os.path.join(
+            store_root,
+            "records",
+            f"records_{data_date.strftime('%Y_%m_%d')}.parquet"
+        )
+        con.execute(
+            f"""
+            COPY (SELECT * FROM new_records ORDER BY appl_id)
+            TO '{records_path}' (FORMAT PARQUET, COMPRESSION ZSTD)
+            """
+        )
+
+    # The manifest is written last so a snapshot only counts once complete
+    con.execute(
+        f"""
+        COPY (
+            SELECT appl_id,
+                   record_hash,
+                   {get_fingerprint_expression()} fingerprint,
+                   year(date_added) year_added,
+                   month(date_added) month_added,
+                   {get_changelog_columns()}
+            FROM incoming
+            ORDER BY appl_id
+        ) TO '{manifest_path}.tmp' (FORMAT PARQUET, COMPRESSION ZSTD)
+        """
+    )
+    os.replace(manifest_path + ".tmp", manifest_path)
+    con.close()
+
+
+def get_snapshot_query(data_date, store_root=STORE_ROOT):
+    """Builds a query that rebuilds a snapshot from its manifest"""
+    return f"""
+        SELECT manifest.year_added,
+               manifest.month_added,
+               records.* EXCLUDE (record_hash)
+        FROM read_parquet('{get_manifest_path(data_date, store_root)}') AS manifest
+        INNER JOIN read_parquet('{get_records_glob(store_root)}') AS records
+          ON manifest.appl_id = records.appl_id
+         AND manifest.record_hash = records.record_hash
+    """
+
+
+def create_snapshot_view(con, data_date, store_root=STORE_ROOT):
+    view_name = f"snapshot_{data_date.strftime('%Y_%m_%d')}"
+    con.execute(
+        f"CREATE OR REPLACE VIEW {view_name} AS "
+        f"{get_snapshot_query(data_date, store_root)}"
+    )
+
+    return view_name
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Deduplicate weekly JSON snapshots into a shared store"
+    )
+    parser.add_argument(
+        "dates",
+        nargs="*",
+        type=datetime.fromisoformat,
+        help="snapshot dates to ingest, defaults to every /data/json_* copy"
+    )
+    parser.add_argument("--store-root", default=STORE_ROOT)
+    parser.add_argument(
+        "--remove-source",
+        action="store_true",
+        help="delete each JSON copy once it has been ingested"
+    )
+    args = parser.parse_args()
+
+    dates = args.dates or sorted(
+        date for date in (
+            parse_snapshot_dir(path, "json") for path in glob("/data/json_*")
+        )
+        if date is not None
+    )
+    for data_date in dates:
+        source_dir = f"/data/json_{data_date.strftime('%Y_%m_%d')}"
+        ingest_snapshot(
+            data_date,
+            os.path.join(source_dir, "projects"),
+            args.store_root
+        )
+        if args.remove_source and has_snapshot(data_date, args.store_root):
+            logger.info(f"Removing {source_dir}")
+            shutil.rmtree(source_dir)
@@ -0,0 +1,186 @@
+import argparse
+import duckdb
+import logging
+import os
+import shutil
+
+from datetime import datetime, timedelta
+from partitions import update_partition_stats
+
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+FIRST_DATE = datetime(2025, 3, 2)
+ADDED_FROM = datetime(2020, 1, 1)
+ADDED_TO = datetime(2025, 3, 1)
+# Tracked fields a churned record may move, and how far
+CHURN_FIELDS = [
+    "project_start_date",
+    "project_end_date",
+    "budget_start",
+    "budget_end",
+]
+MAX_SHIFT_DAYS = 365
+
+
+# Deterministic pseudo-random fields derived from hashes of appl_id
+PROJECTS_QUERY = """
+    CREATE OR REPLACE TABLE projects AS
+    WITH base AS (
+        SELECT 10000000 + i appl_id,
+               TIMESTAMP '{added_from}' + to_seconds(
+                   CAST(hash(i, {seed}, 'added') % {added_span} AS BIGINT)
+               ) date_added,
+               hash(i, {seed}, 'start') % 1460 start_offset,
+               hash(i, {seed}, 'ic') % 20 ic_index,
+               hash(i, {seed}, 'org') % 5000 org_index
+        FROM range({n_projects}) t(i)
+    )
+    SELECT appl_id,
+           year(date_added) + (month(date_added) >= 10)::INTEGER fiscal_year,
+           '5R01' || chr(65 + ic_index::INTEGER) || 'A'
+               || lpad(appl_id::VARCHAR, 8, '0') || '-01' project_num,
+           'R01' || chr(65 + ic_index::INTEGER) || 'A'
+               || lpad(appl_id::VARCHAR, 8, '0') core_project_num,
+           {{
+               'org_name': 'SYNTHETIC ORGANIZATION ' || org_index,
+               'org_country': 'UNITED STATES'
+           }} organization,
+           CAST(hash(appl_id, {seed}, 'amount') % 2000000 AS BIGINT) award_amount,
+           CAST(date_added AS DATE) - start_offset::INTEGER project_start_date,
+           CAST(date_added AS DATE) - start_offset::INTEGER + 1826 project_end_date,
+           CAST(date_added AS DATE) budget_start,
+           CAST(date_added AS DATE) + 364 budget_end,
+           'Synthetic project ' || appl_id project_title,
+           date_added,
+           year(date_added) year_added,
+           strftime(date_added, '%m') month_added
+    FROM base
+    ORDER BY date_added
+"""
+
+
+CHURN_QUERY = """
+    UPDATE projects
+    SET {field} = {field} + CAST(
+        hash(appl_id, {seed}, {week}, 'shift') % {span} AS INTEGER
+    ) - {max_shift}
+    WHERE hash(appl_id, {seed}, {week}, 'churn') % 1000000 < {churn_ppm}
+      AND hash(appl_id, {seed}, {week}, 'field') % {n_fields} = {field_index}
+"""
+
+
+def get_snapshot_dir(data_root, data_date):
+    return os.path.join(data_root, f"json_{data_date.strftime('%Y_%m_%d')}")
+
+
+def write_snapshot(con, data_root, data_date):
+    """Writes one JSON array per year_added/month_added partition"""
+    dest_dir = os.path.join(get_snapshot_dir(data_root, data_date), "projects")
+    shutil.rmtree(dest_dir, ignore_errors=True)
+    partitions = con.execute(
+        "SELECT DISTINCT year_added, month_added FROM projects ORDER BY ALL"
+    ).fetchall()
+    for year_added, month_added in partitions:
+        partition_dir = os.path.join(
+            dest_dir,
+            f"year_added={year_added}",
+            f"month_added={month_added}"
+        )
+        os.makedirs(partition_dir, exist_ok=True)
+        con.execute(
+            f"""
+            COPY (
+                SELECT * EXCLUDE (year_added, month_added)
+                FROM projects
+                WHERE year_added = {year_added}
+                  AND month_added = '{month_added}'
+                ORDER BY date_added, appl_id
+            ) TO '{partition_dir}/projects_added_{year_added}_{month_added}.json'
+            (FORMAT JSON, ARRAY true)
+            """
+        )
+    update_partition_stats(dest_dir)
+
+
+def generate_snapshots(
+    data_root,
+    n_projects,
+    n_weeks,
+    churn_rate,
+    first_date=FIRST_DATE,
+    seed=0
+):
+    """Writes weekly json_YYYY_MM_DD snapshot trees with changing dates
+
+    The first snapshot is the reference week; every later week moves one
+    tracked date on roughly churn_rate of the projects.
+    """
+    con = duckdb.connect()
+    logger.info(f"Generating {n_projects} synthetic projects")
+    con.execute(
+        PROJECTS_QUERY.format(
+            added_from=ADDED_FROM.strftime("%Y-%m-%d"),
+            added_span=int((ADDED_TO - ADDED_FROM).total_seconds()),
+            n_projects=n_projects,
+            seed=seed
+        )
+    )
+
+    dates = []
+    for week in range(n_weeks + 1):
+        data_date = first_date + timedelta(days=7 * week)
+        if week:
+            for field_index, field in enumerate(CHURN_FIELDS):
+                con.execute(
+                    CHURN_QUERY.format(
+                        field=field,
+                        field_index=field_index,
+                        n_fields=len(CHURN_FIELDS),
+                        seed=seed,
+                        week=week,
+                        span=2 * MAX_SHIFT_DAYS + 1,
+                        max_shift=MAX_SHIFT_DAYS,
+                        churn_ppm=int(churn_rate * 1000000)
+                    )
+                )
+        logger.info(f"Writing snapshot for {data_date.strftime('%Y-%m-%d')}")
+        write_snapshot(con, data_root, data_date)
+        dates.append(data_date)
+    con.close()
+
+    return dates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write synthetic weekly RePORTER snapshot trees"
+    )
+    parser.add_argument("data_root", help="directory to write json_* trees to")
+    parser.add_argument("--n-projects", type=int, default=100000)
+    parser.add_argument(
+        "--n-weeks",
+        type=int,
+        default=4,
+        help="weeks to write after the reference snapshot"
+    )
+    parser.add_argument("--churn-rate", type=float, default=0.01)
+    parser.add_argument(
+        "--first-date",
+        type=datetime.fromisoformat,
+        default=FIRST_DATE
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    generate_snapshots(
+        args.data_root,
+        args.n_projects,
+        args.n_weeks,
+        args.churn_rate,
+        args.first_date,
+        args.seed
+    )
@@ -0,0 +1,11 @@
+import os
+import sys
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(SCRIPTS_DIR)
+CHANGELOG_DIR = os.path.join(REPO_ROOT, "public", "changelogs")
+
+# The scripts are run directly rather than installed, so import them the
+# same way
+sys.path.insert(0, SCRIPTS_DIR)
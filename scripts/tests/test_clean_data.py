@@ -0,0 +1,68 @@
+import duckdb
+import os
+import pytest
+
+from conftest import CHANGELOG_DIR
+from glob import glob
+from write_changelog_of_dates import clean_data
+
+
+WEEKLY_FILES = sorted(glob(os.path.join(
+    CHANGELOG_DIR,
+    "weekly",
+    "date",
+    "reporter_date_changelog_*.csv"
+)))
+FIELDS = ["PROJECT_START", "PROJECT_END", "BUDGET_START", "BUDGET_END"]
+
+
+# Rebuilds the old/new frame the change queries return. Fields that did
+# not change get equal old and new values so clean_data drops them again.
+WIDE_QUERY = """
+    SELECT APPLICATION_ID,
+           CORE_PROJECT_NUM,
+           PROJECT_NUM,
+           FY,
+           ORG_NAME,
+           ORG_COUNTRY,
+           DATE_OF_CHANGE,
+           {}
+    FROM read_csv('{}', types={{'OLD_VALUE': 'DATE', 'NEW_VALUE': 'DATE'}})
+    GROUP BY APPLICATION_ID,
+             CORE_PROJECT_NUM,
+             PROJECT_NUM,
+             FY,
+             ORG_NAME,
+             ORG_COUNTRY,
+             DATE_OF_CHANGE
+"""
+FIELD_COLUMNS = """
+           CASE WHEN bool_or(FIELD = '{field}')
+                THEN any_value(OLD_VALUE) FILTER (FIELD = '{field}')
+                ELSE DATE_OF_CHANGE END {field}_OLD,
+           CASE WHEN bool_or(FIELD = '{field}')
+                THEN any_value(NEW_VALUE) FILTER (FIELD = '{field}')
+                ELSE DATE_OF_CHANGE END {field}_NEW"""
+
+
+def get_wide_frame(path):
+    return duckdb.query(WIDE_QUERY.format(
+        ",".join(FIELD_COLUMNS.format(field=field) for field in FIELDS),
+        path
+    )).df()
+
+
+def test_weekly_files_found():
+    assert WEEKLY_FILES
+
+
+@pytest.mark.parametrize(
+    "path",
+    WEEKLY_FILES,
+    ids=[os.path.basename(path) for path in WEEKLY_FILES]
+)
+def test_clean_data_reproduces_weekly_changelog(path):
+    with open(path, newline="") as src:
+        expected = src.read()
+
+    assert clean_data(get_wide_frame(path)).to_csv(index=False) == expected
@@ -0,0 +1,84 @@
+import filecmp
+import json
+import os
+import shutil
+
+import pytest
+import write_changelog_of_dates as changelog
+
+from conftest import CHANGELOG_DIR
+
+
+COMMITTED_COMBINED_PATH = os.path.join(
+    CHANGELOG_DIR,
+    "combined",
+    "reporter_date_changelog.csv"
+)
+
+
+@pytest.fixture
+def changelog_tree(tmp_path, monkeypatch):
+    """A copy of the committed changelogs with no manifest alongside"""
+    shutil.copytree(CHANGELOG_DIR, tmp_path / "changelogs")
+    monkeypatch.setattr(
+        changelog,
+        "WEEKLY_CHANGELOG_DIR",
+        str(tmp_path / "changelogs" / "weekly" / "date")
+    )
+    monkeypatch.setattr(
+        changelog,
+        "COMBINED_CHANGELOG_PATH",
+        str(tmp_path / "changelogs" / "combined" / "reporter_date_changelog.csv")
+    )
+    monkeypatch.setattr(
+        changelog,
+        "COMBINED_MANIFEST_PATH",
+        str(tmp_path / "changelog_state" / "combined_manifest.json")
+    )
+
+    return tmp_path
+
+
+def test_bootstrap_reproduces_committed_combined(changelog_tree):
+    # A fresh checkout has the combined file but no manifest
+    changelog.write_combined_changelog()
+
+    assert filecmp.cmp(
+        changelog.COMBINED_CHANGELOG_PATH,
+        COMMITTED_COMBINED_PATH,
+        shallow=False
+    )
+    with open(changelog.COMBINED_MANIFEST_PATH) as src:
+        assert len(json.load(src)) == len(os.listdir(
+            changelog.WEEKLY_CHANGELOG_DIR
+        ))
+
+
+def test_rerun_is_a_no_op(changelog_tree):
+    changelog.write_combined_changelog()
+    changelog.write_combined_changelog()
+
+    assert filecmp.cmp(
+        changelog.COMBINED_CHANGELOG_PATH,
+        COMMITTED_COMBINED_PATH,
+        shallow=False
+    )
+
+
+def test_incremental_merge_matches_rebuild(changelog_tree):
+    newest = sorted(os.listdir(changelog.WEEKLY_CHANGELOG_DIR))[-1]
+    held_back = changelog_tree / newest
+    shutil.move(
+        os.path.join(changelog.WEEKLY_CHANGELOG_DIR, newest),
+        held_back
+    )
+    changelog.write_combined_changelog()
+
+    shutil.move(held_back, os.path.join(changelog.WEEKLY_CHANGELOG_DIR, newest))
+    changelog.write_combined_changelog()
+
+    assert filecmp.cmp(
+        changelog.COMBINED_CHANGELOG_PATH,
+        COMMITTED_COMBINED_PATH,
+        shallow=False
+    )
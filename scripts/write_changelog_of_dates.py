@@ -1,10 +1,23 @@
+import argparse
+import csv
 import duckdb
+import heapq
 import logging
 import os
-import pandas as pd
 
+from catalog import get_table_name, has_catalog_table
+from checksums import get_file_checksum
 from datetime import datetime, timedelta
 from glob import glob
+from json_files import atomic_write_json, load_json
+from partitions import get_pruned_relation
+from snapshot_store import (
+    get_manifest_path,
+    get_records_glob,
+    get_snapshot_query,
+    has_changelog_columns,
+    has_snapshot
+)
 
 
 logging.basicConfig()
@@ -12,6 +25,22 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+DATA_ROOT = "/data"
+STORE_ROOT = os.path.join(DATA_ROOT, "store")
+CATALOG_PATH = os.path.join(DATA_ROOT, "reporter.duckdb")
+WEEKLY_CHANGELOG_DIR = "/public/changelogs/weekly/date/"
+COMBINED_CHANGELOG_PATH = "/public/changelogs/combined/reporter_date_changelog.csv"
+# Weekly files already merged into the combined changelog, with checksums
+COMBINED_MANIFEST_PATH = os.path.join(
+    DATA_ROOT,
+    "changelog_state",
+    "combined_manifest.json"
+)
+# Records added in this range are compared between snapshots
+CHANGELOG_ADDED_FROM = datetime(2020, 1, 1)
+CHANGELOG_ADDED_TO = datetime(2025, 12, 31)
+
+
 JSON_VS_EXPORTER_QUERY = """
     SELECT new_data.appl_id APPLICATION_ID,
            new_data.core_project_num CORE_PROJECT_NUM,
@@ -21,14 +50,14 @@ JSON_VS_EXPORTER_QUERY = """
            new_data.organization.org_country ORG_COUNTRY,
            DATE '{}' DATE_OF_CHANGE,
            old_data.PROJECT_START PROJECT_START_OLD,
-           date_trunc('day', new_data.project_start_date) PROJECT_START_NEW,
+           CAST(new_data.project_start_date AS DATE) PROJECT_START_NEW,
            old_data.PROJECT_END PROJECT_END_OLD,
-           date_trunc('day', new_data.project_end_date) PROJECT_END_NEW,
+           CAST(new_data.project_end_date AS DATE) PROJECT_END_NEW,
            old_data.BUDGET_START BUDGET_START_OLD,
-           date_trunc('day', new_data.budget_start) BUDGET_START_NEW,
+           CAST(new_data.budget_start AS DATE) BUDGET_START_NEW,
            old_data.BUDGET_END BUDGET_END_OLD,
-           date_trunc('day', new_data.budget_end) BUDGET_END_NEW,
-    FROM read_json('/data/json_{}/projects/year_added=202[012345]/*/*') AS new_data
+           CAST(new_data.budget_end AS DATE) BUDGET_END_NEW,
+    FROM {} AS new_data
     INNER JOIN read_csv('/data/exporter/projects/RePORTER_PRJ_C_FY2024.csv') AS old_data
       ON new_data.appl_id = old_data.APPLICATION_ID
     WHERE PROJECT_START_NEW != PROJECT_START_OLD
@@ -47,16 +76,16 @@ JSON_VS_JSON_QUERY = """
            new_data.organization.org_name ORG_NAME,
            new_data.organization.org_country ORG_COUNTRY,
            DATE '{}' DATE_OF_CHANGE,
-           date_trunc('day', old_data.project_start_date) PROJECT_START_OLD,
-           date_trunc('day', new_data.project_start_date) PROJECT_START_NEW,
-           date_trunc('day', old_data.project_end_date) PROJECT_END_OLD,
-           date_trunc('day', new_data.project_end_date) PROJECT_END_NEW,
-           date_trunc('day', old_data.budget_start) BUDGET_START_OLD,
-           date_trunc('day', new_data.budget_start) BUDGET_START_NEW,
-           date_trunc('day', old_data.budget_end) BUDGET_END_OLD,
-           date_trunc('day', new_data.budget_end) BUDGET_END_NEW,
-    FROM read_json('/data/json_{}/projects/year_added=202[012345]/*/*') AS new_data
-    INNER JOIN read_json('/data/json_{}/projects/year_added=202[012345]/*/*') AS old_data
+           CAST(old_data.project_start_date AS DATE) PROJECT_START_OLD,
+           CAST(new_data.project_start_date AS DATE) PROJECT_START_NEW,
+           CAST(old_data.project_end_date AS DATE) PROJECT_END_OLD,
+           CAST(new_data.project_end_date AS DATE) PROJECT_END_NEW,
+           CAST(old_data.budget_start AS DATE) BUDGET_START_OLD,
+           CAST(new_data.budget_start AS DATE) BUDGET_START_NEW,
+           CAST(old_data.budget_end AS DATE) BUDGET_END_OLD,
+           CAST(new_data.budget_end AS DATE) BUDGET_END_NEW,
+    FROM {} AS new_data
+    INNER JOIN {} AS old_data
       ON new_data.appl_id = old_data.appl_id
     WHERE PROJECT_START_NEW != PROJECT_START_OLD
        OR PROJECT_END_NEW != PROJECT_END_OLD
@@ -66,43 +95,276 @@ JSON_VS_JSON_QUERY = """
 """
 
 
+# Diffs two manifests directly, since each one carries the tracked fields
+MANIFEST_CHANGES_QUERY = """
+    SELECT new_manifest.appl_id APPLICATION_ID,
+           new_manifest.core_project_num CORE_PROJECT_NUM,
+           new_manifest.project_num PROJECT_NUM,
+           new_manifest.fiscal_year FY,
+           new_manifest.org_name ORG_NAME,
+           new_manifest.org_country ORG_COUNTRY,
+           DATE '{data_date}' DATE_OF_CHANGE,
+           old_manifest.project_start_date PROJECT_START_OLD,
+           new_manifest.project_start_date PROJECT_START_NEW,
+           old_manifest.project_end_date PROJECT_END_OLD,
+           new_manifest.project_end_date PROJECT_END_NEW,
+           old_manifest.budget_start BUDGET_START_OLD,
+           new_manifest.budget_start BUDGET_START_NEW,
+           old_manifest.budget_end BUDGET_END_OLD,
+           new_manifest.budget_end BUDGET_END_NEW,
+    FROM read_parquet('{new_manifest}') AS new_manifest
+    INNER JOIN read_parquet('{old_manifest}') AS old_manifest
+      ON new_manifest.appl_id = old_manifest.appl_id
+    WHERE new_manifest.fingerprint != old_manifest.fingerprint
+      AND new_manifest.year_added BETWEEN 2020 AND 2025
+      AND old_manifest.year_added BETWEEN 2020 AND 2025
+      AND (PROJECT_START_NEW != PROJECT_START_OLD
+           OR PROJECT_END_NEW != PROJECT_END_OLD
+           OR BUDGET_START_NEW != BUDGET_START_OLD
+           OR BUDGET_END_NEW != BUDGET_END_OLD)
+    ORDER BY new_manifest.appl_id
+"""
+
+
+# Older manifests only hold fingerprints, so the versions of the changed
+# records are read from the store in one pass and joined from there
+FINGERPRINT_QUERY = """
+    WITH changed AS (
+        SELECT new_manifest.appl_id,
+               new_manifest.record_hash new_hash,
+               old_manifest.record_hash old_hash
+        FROM read_parquet('{new_manifest}') AS new_manifest
+        INNER JOIN read_parquet('{old_manifest}') AS old_manifest
+          ON new_manifest.appl_id = old_manifest.appl_id
+        WHERE new_manifest.fingerprint != old_manifest.fingerprint
+          AND new_manifest.year_added BETWEEN 2020 AND 2025
+          AND old_manifest.year_added BETWEEN 2020 AND 2025
+    ),
+    versions AS MATERIALIZED (
+        SELECT appl_id,
+               record_hash,
+               core_project_num,
+               project_num,
+               fiscal_year,
+               organization.org_name org_name,
+               organization.org_country org_country,
+               CAST(project_start_date AS DATE) project_start_date,
+               CAST(project_end_date AS DATE) project_end_date,
+               CAST(budget_start AS DATE) budget_start,
+               CAST(budget_end AS DATE) budget_end
+        FROM read_parquet('{records}')
+        SEMI JOIN (
+            SELECT appl_id, new_hash record_hash FROM changed
+            UNION
+            SELECT appl_id, old_hash record_hash FROM changed
+        ) AS wanted
+          USING (appl_id, record_hash)
+    )
+    SELECT new_data.appl_id APPLICATION_ID,
+           new_data.core_project_num CORE_PROJECT_NUM,
+           new_data.project_num PROJECT_NUM,
+           new_data.fiscal_year FY,
+           new_data.org_name ORG_NAME,
+           new_data.org_country ORG_COUNTRY,
+           DATE '{data_date}' DATE_OF_CHANGE,
+           old_data.project_start_date PROJECT_START_OLD,
+           new_data.project_start_date PROJECT_START_NEW,
+           old_data.project_end_date PROJECT_END_OLD,
+           new_data.project_end_date PROJECT_END_NEW,
+           old_data.budget_start BUDGET_START_OLD,
+           new_data.budget_start BUDGET_START_NEW,
+           old_data.budget_end BUDGET_END_OLD,
+           new_data.budget_end BUDGET_END_NEW,
+    FROM changed
+    INNER JOIN versions AS new_data
+      ON new_data.appl_id = changed.appl_id
+     AND new_data.record_hash = changed.new_hash
+    INNER JOIN versions AS old_data
+      ON old_data.appl_id = changed.appl_id
+     AND old_data.record_hash = changed.old_hash
+    WHERE PROJECT_START_NEW != PROJECT_START_OLD
+       OR PROJECT_END_NEW != PROJECT_END_OLD
+       OR BUDGET_START_NEW != BUDGET_START_OLD
+       OR BUDGET_END_NEW != BUDGET_END_OLD
+    ORDER BY new_data.appl_id
+"""
+
+
+# Unpivots old/new column pairs into one FIELD/OLD_VALUE/NEW_VALUE row
+# each. Null values count as changed, matching a pandas != comparison.
+CHANGELOG_QUERY = """
+    WITH changes AS (
+        {}
+    )
+    SELECT APPLICATION_ID,
+           CORE_PROJECT_NUM,
+           PROJECT_NUM,
+           FY,
+           ORG_NAME,
+           ORG_COUNTRY,
+           FIELD,
+           DATE_OF_CHANGE,
+           OLD_VALUE,
+           NEW_VALUE
+    FROM changes
+    UNPIVOT INCLUDE NULLS (
+        (OLD_VALUE, NEW_VALUE) FOR FIELD IN (
+            (PROJECT_START_OLD, PROJECT_START_NEW) AS PROJECT_START,
+            (PROJECT_END_OLD, PROJECT_END_NEW) AS PROJECT_END,
+            (BUDGET_START_OLD, BUDGET_START_NEW) AS BUDGET_START,
+            (BUDGET_END_OLD, BUDGET_END_NEW) AS BUDGET_END
+        )
+    )
+    WHERE NOT coalesce(OLD_VALUE = NEW_VALUE, false)
+    ORDER BY APPLICATION_ID,
+             FIELD,
+             DATE_OF_CHANGE,
+             CORE_PROJECT_NUM,
+             PROJECT_NUM,
+             FY,
+             ORG_NAME,
+             ORG_COUNTRY
+"""
+
+
+SNAPSHOT_FIELDS_QUERY = """
+    INSERT INTO snapshot_fields
+    SELECT DATE '{}' snapshot_date,
+           appl_id,
+           core_project_num,
+           project_num,
+           fiscal_year,
+           organization.org_name,
+           organization.org_country,
+           CAST(project_start_date AS DATE),
+           CAST(project_end_date AS DATE),
+           CAST(budget_start AS DATE),
+           CAST(budget_end AS DATE)
+    FROM {}
+"""
+
+
+# Compares every snapshot with the one a week before it in a single pass
+LAGGED_CHANGES_QUERY = """
+    WITH lagged AS (
+        SELECT *,
+               lag(snapshot_date) OVER w previous_date,
+               lag(project_start) OVER w project_start_old,
+               lag(project_end) OVER w project_end_old,
+               lag(budget_start) OVER w budget_start_old,
+               lag(budget_end) OVER w budget_end_old
+        FROM snapshot_fields
+        WINDOW w AS (PARTITION BY appl_id ORDER BY snapshot_date)
+    )
+    SELECT appl_id APPLICATION_ID,
+           core_project_num CORE_PROJECT_NUM,
+           project_num PROJECT_NUM,
+           fiscal_year FY,
+           org_name ORG_NAME,
+           org_country ORG_COUNTRY,
+           snapshot_date DATE_OF_CHANGE,
+           project_start_old PROJECT_START_OLD,
+           project_start PROJECT_START_NEW,
+           project_end_old PROJECT_END_OLD,
+           project_end PROJECT_END_NEW,
+           budget_start_old BUDGET_START_OLD,
+           budget_start BUDGET_START_NEW,
+           budget_end_old BUDGET_END_OLD,
+           budget_end BUDGET_END_NEW,
+    FROM lagged
+    WHERE previous_date = snapshot_date - INTERVAL 7 DAYS
+      AND (PROJECT_START_NEW != PROJECT_START_OLD
+           OR PROJECT_END_NEW != PROJECT_END_OLD
+           OR BUDGET_START_NEW != BUDGET_START_OLD
+           OR BUDGET_END_NEW != BUDGET_END_OLD)
+    ORDER BY DATE_OF_CHANGE, APPLICATION_ID
+"""
+
+
+def get_changes_query(data_date, reference_date):
+    # Use stored fingerprints when both snapshots are in the store
+    if (
+        has_snapshot(data_date, STORE_ROOT)
+        and has_snapshot(reference_date, STORE_ROOT)
+    ):
+        query = FINGERPRINT_QUERY
+        if (
+            has_changelog_columns(data_date, STORE_ROOT)
+            and has_changelog_columns(reference_date, STORE_ROOT)
+        ):
+            query = MANIFEST_CHANGES_QUERY
+        return query.format(
+            data_date=data_date,
+            new_manifest=get_manifest_path(data_date, STORE_ROOT),
+            old_manifest=get_manifest_path(reference_date, STORE_ROOT),
+            records=get_records_glob(STORE_ROOT)
+        )
+
+    return JSON_VS_JSON_QUERY.format(
+        data_date,
+        get_snapshot_source(data_date),
+        get_snapshot_source(reference_date)
+    )
+
+
+def get_json_snapshot_dir(data_date):
+    return os.path.join(DATA_ROOT, f"json_{data_date.strftime('%Y_%m_%d')}")
+
+
+def snapshot_exists(data_date):
+    return (
+        has_snapshot(data_date, STORE_ROOT)
+        or os.path.exists(get_json_snapshot_dir(data_date))
+    )
+
+
+def get_snapshot_source(data_date, con=duckdb):
+    """Prefers the catalog, stored or Parquet copy of a snapshot over JSON
+
+    The catalog is attached to con, so pass the connection the returned
+    relation will be queried on.
+    """
+    if has_catalog_table(data_date, con, CATALOG_PATH):
+        return (
+            f"(SELECT * FROM catalog.{get_table_name(data_date)}"
+            " WHERE year_added BETWEEN 2020 AND 2025)"
+        )
+
+    if has_snapshot(data_date, STORE_ROOT):
+        return (
+            f"({get_snapshot_query(data_date, STORE_ROOT)}"
+            " WHERE manifest.year_added BETWEEN 2020 AND 2025)"
+        )
+
+    # Raw copies are scanned file by file, skipping out-of-range partitions
+    root = os.path.join(
+        DATA_ROOT,
+        f"parquet_{data_date.strftime('%Y_%m_%d')}",
+        "projects"
+    )
+    if not os.path.exists(root):
+        root = os.path.join(get_json_snapshot_dir(data_date), "projects")
+
+    return get_pruned_relation(
+        root,
+        added_from=CHANGELOG_ADDED_FROM,
+        added_to=CHANGELOG_ADDED_TO
+    )
+
+
 def clean_data(data):
-    # Melt data to linearized fields
-    data_long = data.melt(
-        id_vars = ["APPLICATION_ID", "CORE_PROJECT_NUM", "PROJECT_NUM", "FY", "ORG_NAME", "ORG_COUNTRY", "DATE_OF_CHANGE"],
-        var_name="FIELD",
-        value_name="VALUE"
-    )
-    data_long.insert(5, "COLUMN", "")
-    data_long.loc[data_long.FIELD.str.contains("OLD"), "COLUMN"] = "OLD_VALUE"
-    data_long.loc[data_long.FIELD.str.contains("NEW"), "COLUMN"] = "NEW_VALUE"
-    data_long.loc[:, "FIELD"] = (
-        data_long.FIELD
-                 .str.replace("_[^_]+$", "", regex=True)
-    )
-
-    # Widen out old and new values to make changelog
-    data_final = data_long.pivot(
-        index = ["APPLICATION_ID", "CORE_PROJECT_NUM", "PROJECT_NUM", "FY", "ORG_NAME", "ORG_COUNTRY", "DATE_OF_CHANGE", "FIELD"],
-        columns = "COLUMN",
-        values = "VALUE"
-    ).reset_index()
-    data_final = data_final[data_final.NEW_VALUE != data_final.OLD_VALUE]
-    data_final = data_final.sort_values(
-        ["APPLICATION_ID", "FIELD", "DATE_OF_CHANGE"]
-    ).loc[:,
-        ["APPLICATION_ID", "CORE_PROJECT_NUM", "PROJECT_NUM", "FY", "ORG_NAME", "ORG_COUNTRY", "FIELD", "DATE_OF_CHANGE", "OLD_VALUE", "NEW_VALUE"]
-    ]
+    """Turns a wide frame of old/new columns into changelog rows"""
+    con = duckdb.connect()
+    con.register("data", data)
+    data_final = con.execute(CHANGELOG_QUERY.format("SELECT * FROM data")).df()
+    con.close()
 
     return data_final
 
 
 def write_initial_changelog():
     data_date = datetime.fromisoformat("2025-03-02")
-    dest_file = os.path.join(
-        "/public/changelogs/weekly/date/",
-        f"reporter_date_changelog_{data_date.strftime('%Y_%m_%d')}.csv"
-    )
+    dest_file = get_weekly_changelog_path(data_date)
 
     if os.path.exists(dest_file):
         logger.info(
@@ -113,45 +375,45 @@ def write_initial_changelog():
         f"Writing changelog for {data_date}"
     )
 
-    data = duckdb.query(
-        JSON_VS_EXPORTER_QUERY.format(
-            data_date,
-            data_date.strftime("%Y_%m_%d")
+    data_final = duckdb.query(
+        CHANGELOG_QUERY.format(
+            JSON_VS_EXPORTER_QUERY.format(
+                data_date,
+                get_snapshot_source(data_date)
+            )
         )
     ).to_df()
-    data_final = clean_data(data)
     data_final.to_csv(dest_file, index=False)
 
 
+def get_weekly_changelog_path(data_date):
+    return os.path.join(
+        WEEKLY_CHANGELOG_DIR,
+        f"reporter_date_changelog_{data_date.strftime('%Y_%m_%d')}.csv"
+    )
+
+
 def write_weekly_changelog():
     data_date = datetime.fromisoformat("2025-03-09")
-    data_path = f"/data/json_{data_date.strftime('%Y_%m_%d')}"
-    while os.path.exists(data_path):
-        dest_file = os.path.join(
-            "/public/changelogs/weekly/date/",
-            f"reporter_date_changelog_{data_date.strftime('%Y_%m_%d')}.csv"
-        )
+    while snapshot_exists(data_date):
+        dest_file = get_weekly_changelog_path(data_date)
 
         if os.path.exists(dest_file):
             logger.info(
                 f"Found changelog for {data_date}. Skipping..."
             )
             data_date += timedelta(days=7)
-            data_path = f"/data/json_{data_date.strftime('%Y_%m_%d')}"
             continue
         logger.info(
             f"Writing changelog for {data_date}"
         )
     
         reference_date = data_date - timedelta(days=7)
-        data = duckdb.query(
-            JSON_VS_JSON_QUERY.format(
-                data_date,
-                data_date.strftime("%Y_%m_%d"),
-                reference_date.strftime("%Y_%m_%d")
+        data_final = duckdb.query(
+            CHANGELOG_QUERY.format(
+                get_changes_query(data_date, reference_date)
             )
         ).to_df()
-        data_final = clean_data(data)
     
         data_final.to_csv(
             dest_file,
@@ -159,26 +421,160 @@ def write_weekly_changelog():
         )
     
         data_date += timedelta(days=7)
-        data_path = f"/data/json_{data_date.strftime('%Y_%m_%d')}"
+
+
+def backfill_weekly_changelogs():
+    """Writes every missing weekly changelog from one windowed query"""
+    missing_dates = []
+    data_date = datetime.fromisoformat("2025-03-09")
+    while snapshot_exists(data_date):
+        if not os.path.exists(get_weekly_changelog_path(data_date)):
+            missing_dates.append(data_date)
+        data_date += timedelta(days=7)
+
+    if not missing_dates:
+        logger.info("No missing changelogs found")
+        return
+
+    # Load each snapshot once, including the week before each missing one
+    snapshot_dates = sorted(
+        set(missing_dates) |
+        {data_date - timedelta(days=7) for data_date in missing_dates}
+    )
+    con = duckdb.connect()
+    con.execute(
+        """
+        CREATE TABLE snapshot_fields (
+            snapshot_date DATE,
+            appl_id BIGINT,
+            core_project_num VARCHAR,
+            project_num VARCHAR,
+            fiscal_year INTEGER,
+            org_name VARCHAR,
+            org_country VARCHAR,
+            project_start DATE,
+            project_end DATE,
+            budget_start DATE,
+            budget_end DATE
+        )
+        """
+    )
+    for data_date in snapshot_dates:
+        logger.info(
+            f"Loading snapshot {data_date}"
+        )
+        con.execute(
+            SNAPSHOT_FIELDS_QUERY.format(
+                data_date,
+                get_snapshot_source(data_date, con)
+            )
+        )
+
+    data = con.execute(
+        CHANGELOG_QUERY.format(LAGGED_CHANGES_QUERY)
+    ).df()
+    con.close()
+    for data_date in missing_dates:
+        logger.info(
+            f"Writing changelog for {data_date}"
+        )
+        data_final = data[data.DATE_OF_CHANGE == data_date]
+        data_final.to_csv(
+            get_weekly_changelog_path(data_date),
+            index = False
+        )
+
+
+def iter_changelog_rows(path):
+    """Yields sort key and row for each changelog entry from FY 2023 on"""
+    with open(path, newline="") as src:
+        reader = csv.reader(src)
+        header = next(reader)
+        application_id = header.index("APPLICATION_ID")
+        field = header.index("FIELD")
+        date_of_change = header.index("DATE_OF_CHANGE")
+        fiscal_year = header.index("FY")
+        for row in reader:
+            if not row[fiscal_year] or int(row[fiscal_year]) < 2023:
+                continue
+            yield (
+                (int(row[application_id]), row[field], row[date_of_change]),
+                row
+            )
 
 
 def write_combined_changelog():
+    """Merges new weekly changelogs into the sorted combined changelog"""
     logger.info("Combining changelogs...")
-    data_full = pd.concat([
-        pd.read_csv(f)
-        for f in glob("/public/changelogs/weekly/date/reporter_date_changelog_*")
-    ])
-    data_full = data_full.sort_values(
-        ["APPLICATION_ID", "FIELD", "DATE_OF_CHANGE"]
+    weekly_files = sorted(glob(os.path.join(
+        WEEKLY_CHANGELOG_DIR,
+        "reporter_date_changelog_*"
+    )))
+    checksums = {
+        os.path.basename(path): get_file_checksum(path)
+        for path in weekly_files
+    }
+
+    manifest = load_json(COMBINED_MANIFEST_PATH, {})
+
+    # Rebuild from scratch if there is no manifest to say what the combined
+    # file already holds, or an incorporated weekly file changed or vanished
+    incremental = (
+        bool(manifest)
+        and os.path.exists(COMBINED_CHANGELOG_PATH)
+        and all(
+            checksums.get(name) == checksum
+            for name, checksum in manifest.items()
+        )
     )
-    data_full = data_full[data_full.FY >= 2023]
-    data_full.to_csv(
-        "/public/changelogs/combined/reporter_date_changelog.csv",
-        index=False
+    if incremental:
+        sources = [
+            path for path in weekly_files
+            if os.path.basename(path) not in manifest
+        ]
+        if not sources:
+            logger.info("Combined changelog is up to date")
+            return
+        sources.append(COMBINED_CHANGELOG_PATH)
+    else:
+        logger.info("Rebuilding combined changelog from all weekly files")
+        sources = weekly_files
+    logger.info(
+        f"Merging {len(sources)} sorted changelogs"
     )
 
+    # k-way merge of already sorted files, one row per file in memory
+    with open(sources[0], newline="") as src:
+        header = next(csv.reader(src))
+    tmp_path = COMBINED_CHANGELOG_PATH + ".tmp"
+    with open(tmp_path, "w", newline="") as dest:
+        writer = csv.writer(dest, lineterminator="\n")
+        writer.writerow(header)
+        merged = heapq.merge(
+            *[iter_changelog_rows(path) for path in sources],
+            key=lambda entry: entry[0]
+        )
+        for _, row in merged:
+            writer.writerow(row)
+    os.replace(tmp_path, COMBINED_CHANGELOG_PATH)
+
+    atomic_write_json(COMBINED_MANIFEST_PATH, checksums)
+
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Write the RePORTER date changelogs"
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="write all missing weekly changelogs in a single pass"
+    )
+    args = parser.parse_args()
+
     write_initial_changelog()
-    write_weekly_changelog()
+    if args.backfill:
+        backfill_weekly_changelogs()
+    else:
+        write_weekly_changelog()
     write_combined_changelog()